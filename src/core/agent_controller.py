@@ -29,20 +29,23 @@ class AgentState:
 class AgentController:
     """Main controller that orchestrates the agentic battery optimization system"""
     
-    def __init__(self, config_path: str = "config/default.json"):
+    def __init__(self, config_path: str = "config/default.json",
+                 monitor: Optional[SystemMonitor] = None,
+                 agent: Optional[BatteryOptimizationAgent] = None,
+                 actuator: Optional[OptimizationActuator] = None):
         self.logger = logging.getLogger(__name__)
         
         # Load configuration
         self.config = self._load_config(config_path)
         
-        # Initialize core components
-        self.monitor = SystemMonitor(
+        # Initialize core components, reusing any the caller already owns
+        self.monitor = monitor if monitor is not None else SystemMonitor(
             update_interval=self.config.get('monitoring_interval', 2.0)
         )
-        self.agent = BatteryOptimizationAgent(
+        self.agent = agent if agent is not None else BatteryOptimizationAgent(
             model_path=self.config.get('model_path', 'models/battery_agent.pkl')
         )
-        self.actuator = OptimizationActuator()
+        self.actuator = actuator if actuator is not None else OptimizationActuator()
         
         # Agent state
         self.state = AgentState(
@@ -72,7 +75,8 @@ class AgentController:
             'metrics_update': [],
             'decision_made': [],
             'action_applied': [],
-            'user_feedback': []
+            'user_feedback': [],
+            'target_apps_changed': []
         }
         
         # Emergency fallback settings
@@ -148,12 +152,14 @@ class AgentController:
             self.actuator.register_app_optimizer(app_name, app_instance.optimize_for_battery)
         
         self.logger.info(f"📱 Registered target application: {app_name}")
+        self._trigger_event('target_apps_changed', self.target_applications)
     
     def unregister_target_application(self, app_name: str):
         """Unregister a target application"""
         if app_name in self.target_applications:
             del self.target_applications[app_name]
             self.logger.info(f"📱 Unregistered target application: {app_name}")
+            self._trigger_event('target_apps_changed', self.target_applications)
     
     def set_optimization_mode(self, mode: str):
         """Set optimization mode (aggressive, balanced, conservative)"""
@@ -3,6 +3,7 @@ System Monitoring Layer - Sensors for battery, CPU, network, and application met
 """
 
 import psutil
+import numpy as np
 import time
 import threading
 import logging
@@ -39,6 +40,17 @@ class SystemMetrics:
     target_app_cpu: float
     target_app_memory: float
 
+# Fields mirrored into the column-oriented history buffers
+HISTORY_FIELDS = (
+    'timestamp',
+    'battery_percent',
+    'battery_power_draw',
+    'cpu_percent',
+    'memory_percent',
+    'gpu_percent',
+    'target_app_cpu'
+)
+
 class SystemMonitor:
     """Real-time system monitoring with lightweight sensors"""
     
@@ -52,9 +64,22 @@ class SystemMonitor:
         self.metrics_history = deque(maxlen=1000)  # Keep last 1000 readings
         self.current_metrics = None
         
+        # Column-oriented ring buffers (one array per field) for bulk export
+        self._history_capacity = self.metrics_history.maxlen
+        self._history_columns = {
+            field: np.zeros(self._history_capacity, dtype=np.float64)
+            for field in HISTORY_FIELDS
+        }
+        self._history_head = 0
+        self._history_size = 0
+        self._history_lock = threading.Lock()
+        
         # Callbacks for real-time notifications
         self.callbacks: List[Callable[[SystemMetrics], None]] = []
         
+        # Prime cpu_percent so collect_metrics can read it without sleeping
+        psutil.cpu_percent(interval=None)
+        
         # Initialize GPU monitoring if available
         self.gpu_initialized = False
         if GPU_AVAILABLE:
@@ -169,7 +194,8 @@ class SystemMonitor:
         battery_percent, battery_power_draw = self._get_battery_info()
         
         # CPU metrics
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        # Non-blocking: usage since the previous call (primed in __init__)
+        cpu_percent = psutil.cpu_percent(interval=None)
         cpu_freq = psutil.cpu_freq()
         cpu_freq_current = cpu_freq.current if cpu_freq else 0.0
         
@@ -233,6 +259,7 @@ class SystemMonitor:
                 metrics = self.collect_metrics()
                 self.current_metrics = metrics
                 self.metrics_history.append(metrics)
+                self._record_history(metrics)
                 
                 # Notify callbacks
                 for callback in self.callbacks:
@@ -278,6 +305,36 @@ class SystemMonitor:
         cutoff_time = time.time() - duration_seconds
         return [m for m in self.metrics_history if m.timestamp >= cutoff_time]
     
+    def _record_history(self, metrics: SystemMetrics):
+        """Write metrics into the column-oriented ring buffers"""
+        with self._history_lock:
+            head = self._history_head
+            for field, column in self._history_columns.items():
+                column[head] = getattr(metrics, field)
+            self._history_head = (head + 1) % self._history_capacity
+            self._history_size = min(self._history_size + 1, self._history_capacity)
+    
+    def get_metrics_history_arrays(self, duration_seconds: int = 300,
+                                   since: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Get metrics history as parallel numpy arrays, one per field in HISTORY_FIELDS
+        
+        If since is given, only samples with a timestamp strictly after it are returned.
+        """
+        cutoff_time = time.time() - duration_seconds
+        
+        with self._history_lock:
+            # Chronological order of the occupied ring slots
+            start = (self._history_head - self._history_size) % self._history_capacity
+            order = (np.arange(self._history_size) + start) % self._history_capacity
+            
+            timestamps = self._history_columns['timestamp'][order]
+            first = np.searchsorted(timestamps, cutoff_time, side='left')
+            if since is not None:
+                first = max(first, np.searchsorted(timestamps, since, side='right'))
+            order = order[first:]
+            
+            return {field: column[order] for field, column in self._history_columns.items()}
+    
     def get_average_metrics(self, duration_seconds: int = 60) -> Optional[Dict]:
         """Get averaged metrics over specified duration"""
         history = self.get_metrics_history(duration_seconds)
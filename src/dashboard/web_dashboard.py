@@ -3,15 +3,133 @@ Web Dashboard for Battery Optimization System Monitoring
 """
 
 import json
+import math
+import hashlib
+import gzip
 import time
 import logging
 from datetime import datetime
-from flask import Flask, render_template, jsonify, request, Response
-from typing import Dict, Any, Optional
+from flask import Flask, request, Response
+from typing import Dict, List, Tuple, Any, Optional, Callable
 import threading
+import queue
+import struct
+from collections import deque
 import os
 from pathlib import Path
 
+_HERE = Path(__file__).resolve().parent
+_TEMPLATES = _HERE / 'templates'
+_STATIC = _HERE / 'static'
+
+# Minified, Brotli-compressed page written by scripts/build_dashboard.py (optional)
+BROTLI_ASSET = _STATIC / 'dashboard.html.br'
+
+# Try to import the fast JSON encoder (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Try to import the binary stream encoder (optional)
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Try to import the production WSGI server (optional)
+try:
+    import waitress
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_default(obj):
+    """Serialize numpy arrays/scalars that the JSON encoder can't handle natively"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dumps(obj) -> bytes:
+    """Encode an object as JSON bytes, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_json_default).encode('utf-8')
+
+# Field order of the tuples kept in real_time_data['metrics']
+REALTIME_METRIC_FIELDS = ('timestamp', 'battery_percent', 'cpu_percent', 'power_draw')
+
+# Minimum spacing between server-sent event frames
+_SSE_COALESCE_SECONDS = 0.2
+_SSE_PREFIX = b'data: '
+_SSE_SUFFIX = b'\n\n'
+
+# Every JSON frame has the same keys, so only the values are formatted per frame
+_SSE_FRAME_TEMPLATE = (
+    b'data: {"timestamp":%.3f,"metrics":{'
+    b'"battery_percent":%.2f,"battery_power_draw":%.2f,"cpu_percent":%.2f,'
+    b'"memory_percent":%.2f,"gpu_percent":%.2f},"state":%b,"optimizations":%b}\n\n'
+)
+
+# Bulk JSON is repetitive enough that gzip level 4 gets most of the size win cheaply
+_GZIP_LEVEL = 4
+_GZIP_MIN_SIZE = 512
+
+def _accepts_gzip(body: bytes) -> bool:
+    """Whether the current request accepts gzip and the body is worth compressing"""
+    return len(body) >= _GZIP_MIN_SIZE and request.accept_encodings['gzip'] > 0
+
+def _vary_response(body: bytes) -> Response:
+    """Uncompressed JSON response for a route that may also answer with gzip"""
+    response = Response(body, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    return response
+
+def _gzip_response(compressed: bytes) -> Response:
+    """JSON response whose body is already gzip-encoded"""
+    response = _vary_response(compressed)
+    response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+def _not_modified(etag: str) -> Response:
+    """Empty 304 response confirming the client's cached copy"""
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+def _not_modified_or(body: bytes, etag: str) -> Response:
+    """Answer 304 if the client already holds this ETag, else send the JSON body"""
+    if etag in request.if_none_match:
+        return _not_modified(etag)
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+def _json_response(obj, compress: bool = False) -> Response:
+    """Build a JSON response without going through jsonify"""
+    body = _dumps(obj)
+    if compress and _accepts_gzip(body):
+        return _gzip_response(gzip.compress(body, compresslevel=_GZIP_LEVEL))
+    return _vary_response(body) if compress else Response(body, mimetype='application/json')
+
+def _request_json():
+    """Parse the request body as a JSON object, returning (data, None) or (None, error response)"""
+    try:
+        data = _loads(request.get_data())
+    except ValueError:
+        return None, (_json_response({'success': False, 'error': 'Invalid JSON body'}), 400)
+    if not isinstance(data, dict):
+        return None, (_json_response({'success': False, 'error': 'JSON body must be an object'}), 400)
+    return data, None
+
 class WebDashboard:
     """Web-based dashboard for monitoring the battery optimization system"""
     
@@ -23,17 +141,44 @@ class WebDashboard:
         
         # Flask app setup
         self.app = Flask(__name__, 
-                        template_folder=str(Path(__file__).parent / 'templates'),
-                        static_folder=str(Path(__file__).parent / 'static'))
+                        template_folder=str(_TEMPLATES),
+                        static_folder=str(_STATIC))
         
         # Real-time data storage
         self.real_time_data = {
-            'metrics': [],
-            'decisions': [],
-            'actions': [],
-            'feedback': []
+            'metrics': deque(maxlen=100),
+            'decisions': deque(maxlen=50),
+            'actions': deque(maxlen=50),
+            'feedback': deque(maxlen=20)
         }
         
+        # Short-lived serialized responses for endpoints not refreshed by callbacks
+        self._ttl_cache: Dict[str, Tuple[float, bytes]] = {}
+        
+        # Pre-serialized API snapshots, refreshed from the controller callbacks
+        self._cache: Dict[str, bytes] = {}
+        self._cache_lock = threading.Lock()
+        
+        # Per-snapshot version counters used as ETags; the prefix keeps tags from
+        # a previous process from matching after a restart
+        self._cache_versions: Dict[str, int] = {}
+        self._etag_prefix = format(time.time_ns(), 'x')
+        
+        # Server-sent events: the metrics callback only marks the state dirty and a
+        # single publisher thread serializes at most one frame per coalescing window
+        self._latest_frames: Dict[str, bytes] = {}
+        self._latest_metrics = None
+        self._dirty = threading.Event()
+        self._subscribers: Dict[str, List[queue.Queue]] = {'json': [], 'msgpack': []}
+        self._subscribers_lock = threading.Lock()
+        
+        self._publisher_thread = threading.Thread(target=self._sse_publisher, daemon=True)
+        self._publisher_thread.start()
+        
+        # Stats providers for /api/target_apps, rebuilt when apps (un)register
+        self._target_app_handlers: Dict[str, Callable[[], Any]] = {}
+        self._rebuild_target_app_handlers(agent_controller.target_applications)
+        
         # Setup routes
         self._setup_routes()
         
@@ -46,118 +191,87 @@ class WebDashboard:
         """Setup Flask routes"""
         
         @self.app.route('/')
+        @self.app.route('/dashboard.html')
         def index():
-            return render_template('dashboard.html')
+            # Static page: send precompressed bytes in the best encoding the client accepts
+            if _TEMPLATE_BR is not None and request.accept_encodings['br'] > 0:
+                response = Response(_TEMPLATE_BR, mimetype='text/html')
+                response.headers['Content-Encoding'] = 'br'
+            elif request.accept_encodings['gzip'] > 0:
+                response = Response(_TEMPLATE_GZ, mimetype='text/html')
+                response.headers['Content-Encoding'] = 'gzip'
+            else:
+                response = Response(_TEMPLATE_BYTES, mimetype='text/html')
+            response.vary.add('Accept-Encoding')
+            response.headers['Cache-Control'] = 'public, max-age=3600'
+            return response
         
         @self.app.route('/api/status')
         def get_status():
             """Get current system status"""
-            return jsonify(self.agent_controller.get_current_state())
+            return self._cached_json('status', self.agent_controller.get_current_state)
         
         @self.app.route('/api/metrics')
         def get_metrics():
             """Get current system metrics"""
-            current_metrics = self.agent_controller.monitor.get_current_metrics()
-            if current_metrics:
-                return jsonify({
-                    'timestamp': current_metrics.timestamp,
-                    'battery_percent': current_metrics.battery_percent,
-                    'battery_power_draw': current_metrics.battery_power_draw,
-                    'cpu_percent': current_metrics.cpu_percent,
-                    'memory_percent': current_metrics.memory_percent,
-                    'gpu_percent': current_metrics.gpu_percent,
-                    'screen_brightness': current_metrics.screen_brightness,
-                    'target_app_cpu': current_metrics.target_app_cpu,
-                    'target_app_memory': current_metrics.target_app_memory
-                })
-            return jsonify({})
+            return self._cached_json('metrics', self._metrics_payload)
         
         @self.app.route('/api/metrics/history')
         def get_metrics_history():
-            """Get metrics history"""
+            """Get metrics history as parallel arrays, one per metric field"""
             duration = request.args.get('duration', 300, type=int)  # 5 minutes default
-            history = self.agent_controller.monitor.get_metrics_history(duration)
-            
-            data = []
-            for metrics in history:
-                data.append({
-                    'timestamp': metrics.timestamp,
-                    'battery_percent': metrics.battery_percent,
-                    'battery_power_draw': metrics.battery_power_draw,
-                    'cpu_percent': metrics.cpu_percent,
-                    'memory_percent': metrics.memory_percent,
-                    'gpu_percent': metrics.gpu_percent,
-                    'target_app_cpu': metrics.target_app_cpu
-                })
-            
-            return jsonify(data)
+            since = request.args.get('since', None, type=float)  # Only samples newer than this
+            history = self.agent_controller.monitor.get_metrics_history_arrays(duration, since)
+            return _json_response(history, compress=True)
         
         @self.app.route('/api/optimizations')
         def get_active_optimizations():
             """Get currently active optimizations"""
-            active_actions = self.agent_controller.actuator.get_active_actions()
-            
-            optimizations = []
-            for action_id, action_info in active_actions.items():
-                action = action_info['action']
-                result = action_info['result']
-                
-                optimizations.append({
-                    'id': action_id,
-                    'type': action.action_type,
-                    'intensity': action.intensity,
-                    'target': action.target_component,
-                    'estimated_savings': action.estimated_savings,
-                    'performance_impact': action.performance_impact,
-                    'confidence': action.confidence,
-                    'timestamp': action_info['timestamp'],
-                    'success': result.success,
-                    'previous_value': result.previous_value,
-                    'new_value': result.new_value
-                })
-            
-            return jsonify(optimizations)
+            return self._cached_json('optimizations', self._optimizations_payload, compress=True)
         
         @self.app.route('/api/statistics')
         def get_statistics():
             """Get performance statistics"""
-            return jsonify(self.agent_controller.get_performance_statistics())
+            body = self._memo('statistics', 0.5,
+                              lambda: _dumps(self.agent_controller.get_performance_statistics()))
+            return Response(body, mimetype='application/json')
         
         @self.app.route('/api/system_state')
         def get_system_state():
             """Get current state of all optimizers"""
-            return jsonify(self.agent_controller.actuator.get_system_state())
+            body = self._memo('system_state', 0.5,
+                              lambda: _dumps(self.agent_controller.actuator.get_system_state()))
+            # Optimizer state is read live, so tag it by content rather than by version
+            return _not_modified_or(body, hashlib.blake2b(body, digest_size=8).hexdigest())
         
         @self.app.route('/api/target_apps')
         def get_target_apps():
             """Get registered target applications"""
-            apps = {}
-            for app_name, app_instance in self.agent_controller.target_applications.items():
-                if hasattr(app_instance, 'get_current_stats'):
-                    apps[app_name] = app_instance.get_current_stats()
-                else:
-                    apps[app_name] = {'name': app_name, 'status': 'registered'}
-            
-            return jsonify(apps)
+            handlers = self._target_app_handlers
+            return _json_response({name: handler() for name, handler in handlers.items()})
         
         @self.app.route('/api/control/pause', methods=['POST'])
         def pause_optimization():
             """Pause optimization"""
             self.agent_controller.pause_optimization()
-            return jsonify({'success': True, 'message': 'Optimization paused'})
+            self._invalidate_cache('status')
+            return _json_response({'success': True, 'message': 'Optimization paused'})
         
         @self.app.route('/api/control/resume', methods=['POST'])
         def resume_optimization():
             """Resume optimization"""
             self.agent_controller.resume_optimization()
-            return jsonify({'success': True, 'message': 'Optimization resumed'})
+            self._invalidate_cache('status')
+            return _json_response({'success': True, 'message': 'Optimization resumed'})
         
         @self.app.route('/api/control/revert_all', methods=['POST'])
         def revert_all():
             """Revert all optimizations"""
             results = self.agent_controller.actuator.revert_all_actions()
+            self._invalidate_cache('status')
+            self._rebuild_optimizations_cache()
             successful = len([r for r in results if r.success])
-            return jsonify({
+            return _json_response({
                 'success': True, 
                 'message': f'Reverted {successful}/{len(results)} optimizations'
             })
@@ -166,8 +280,10 @@ class WebDashboard:
         def emergency_revert():
             """Emergency revert all optimizations"""
             results = self.agent_controller.emergency_revert()
+            self._invalidate_cache('status')
+            self._rebuild_optimizations_cache()
             successful = len([r for r in results if r.success])
-            return jsonify({
+            return _json_response({
                 'success': True, 
                 'message': f'Emergency reverted {successful}/{len(results)} optimizations'
             })
@@ -175,19 +291,24 @@ class WebDashboard:
         @self.app.route('/api/control/mode', methods=['POST'])
         def set_optimization_mode():
             """Set optimization mode"""
-            data = request.get_json()
+            data, error = _request_json()
+            if error:
+                return error
             mode = data.get('mode', 'balanced')
             
             try:
                 self.agent_controller.set_optimization_mode(mode)
-                return jsonify({'success': True, 'message': f'Mode set to {mode}'})
+                self._invalidate_cache('status')
+                return _json_response({'success': True, 'message': f'Mode set to {mode}'})
             except Exception as e:
-                return jsonify({'success': False, 'error': str(e)})
+                return _json_response({'success': False, 'error': str(e)})
         
         @self.app.route('/api/feedback', methods=['POST'])
         def submit_feedback():
             """Submit user feedback"""
-            data = request.get_json()
+            data, error = _request_json()
+            if error:
+                return error
             
             try:
                 self.agent_controller.provide_user_feedback(
@@ -196,53 +317,44 @@ class WebDashboard:
                     battery_improvement=data.get('battery_improvement', True),
                     comments=data.get('comments', '')
                 )
-                return jsonify({'success': True, 'message': 'Feedback recorded'})
+                return _json_response({'success': True, 'message': 'Feedback recorded'})
             except Exception as e:
-                return jsonify({'success': False, 'error': str(e)})
+                return _json_response({'success': False, 'error': str(e)})
         
         @self.app.route('/api/realtime')
         def realtime_stream():
-            """Server-sent events for real-time updates"""
-            def generate():
-                while True:
-                    # Get latest data
-                    current_metrics = self.agent_controller.monitor.get_current_metrics()
-                    current_state = self.agent_controller.get_current_state()
-                    
-                    if current_metrics:
-                        data = {
-                            'timestamp': time.time(),
-                            'metrics': {
-                                'battery_percent': current_metrics.battery_percent,
-                                'battery_power_draw': current_metrics.battery_power_draw,
-                                'cpu_percent': current_metrics.cpu_percent,
-                                'memory_percent': current_metrics.memory_percent,
-                                'gpu_percent': current_metrics.gpu_percent
-                            },
-                            'state': current_state
-                        }
-                        
-                        yield f"data: {json.dumps(data)}\\n\\n"
-                    
-                    time.sleep(2)  # Update every 2 seconds
-            
-            return Response(generate(), mimetype='text/plain')
+            """Server-sent events for real-time updates
+            
+            ?format=msgpack streams length-prefixed MessagePack frames instead
+            (4-byte big-endian length, then the payload; length 0 is a keepalive).
+            """
+            if request.args.get('format') == 'msgpack':
+                if not MSGPACK_AVAILABLE:
+                    return _json_response({'success': False, 'error': 'msgpack not available'}), 501
+                return Response(self._stream_frames('msgpack', b'\x00\x00\x00\x00'),
+                                mimetype='application/octet-stream', direct_passthrough=True)
+            
+            response = Response(self._stream_frames('json', b': keepalive\n\n'),
+                                mimetype='text/event-stream', direct_passthrough=True)
+            response.headers['Cache-Control'] = 'no-cache'
+            response.headers['X-Accel-Buffering'] = 'no'  # Don't let proxies buffer frames
+            return response
     
     def _setup_callbacks(self):
         """Setup callbacks to collect real-time data"""
         
         def on_metrics_update(metrics):
-            # Store recent metrics (keep last 100)
-            metric_data = {
-                'timestamp': metrics.timestamp,
-                'battery_percent': metrics.battery_percent,
-                'cpu_percent': metrics.cpu_percent,
-                'power_draw': metrics.battery_power_draw
-            }
+            # Store recent metrics (keep last 100) as REALTIME_METRIC_FIELDS tuples
+            self.real_time_data['metrics'].append((
+                metrics.timestamp,
+                metrics.battery_percent,
+                metrics.cpu_percent,
+                metrics.battery_power_draw
+            ))
             
-            self.real_time_data['metrics'].append(metric_data)
-            if len(self.real_time_data['metrics']) > 100:
-                self.real_time_data['metrics'] = self.real_time_data['metrics'][-50:]
+            # Serialization happens on the publisher thread
+            self._latest_metrics = metrics
+            self._dirty.set()
         
         def on_decision_made(data):
             # Store decision data
@@ -253,8 +365,6 @@ class WebDashboard:
             }
             
             self.real_time_data['decisions'].append(decision_data)
-            if len(self.real_time_data['decisions']) > 50:
-                self.real_time_data['decisions'] = self.real_time_data['decisions'][-25:]
         
         def on_action_applied(result):
             # Store action results
@@ -266,8 +376,9 @@ class WebDashboard:
             }
             
             self.real_time_data['actions'].append(action_data)
-            if len(self.real_time_data['actions']) > 50:
-                self.real_time_data['actions'] = self.real_time_data['actions'][-25:]
+            
+            self._rebuild_optimizations_cache()
+            self._dirty.set()  # Push the new list to streaming clients
         
         def on_user_feedback(feedback):
             # Store feedback
@@ -276,52 +387,287 @@ class WebDashboard:
                 'satisfaction': feedback['satisfaction_score'],
                 'performance_acceptable': feedback['performance_acceptable']
             })
-            if len(self.real_time_data['feedback']) > 20:
-                self.real_time_data['feedback'] = self.real_time_data['feedback'][-10:]
         
         # Register callbacks
         self.agent_controller.add_event_callback('metrics_update', on_metrics_update)
         self.agent_controller.add_event_callback('decision_made', on_decision_made)
         self.agent_controller.add_event_callback('action_applied', on_action_applied)
         self.agent_controller.add_event_callback('user_feedback', on_user_feedback)
+        self.agent_controller.add_event_callback('target_apps_changed', self._rebuild_target_app_handlers)
+    
+    def _rebuild_target_app_handlers(self, target_applications: Dict[str, Any]):
+        """Resolve each app's stats provider once, when the registered set changes"""
+        handlers = {}
+        for app_name, app_instance in target_applications.items():
+            if hasattr(app_instance, 'get_current_stats'):
+                handlers[app_name] = app_instance.get_current_stats
+            else:
+                handlers[app_name] = lambda name=app_name: {'name': name, 'status': 'registered'}
+        
+        # Swap in a new table so requests never iterate a dict being mutated
+        self._target_app_handlers = handlers
+    
+    def _metrics_payload(self) -> Dict[str, Any]:
+        """Build the /api/metrics payload from the latest monitor sample"""
+        current_metrics = self.agent_controller.monitor.get_current_metrics()
+        if not current_metrics:
+            return {}
+        
+        return {
+            'timestamp': current_metrics.timestamp,
+            'battery_percent': current_metrics.battery_percent,
+            'battery_power_draw': current_metrics.battery_power_draw,
+            'cpu_percent': current_metrics.cpu_percent,
+            'memory_percent': current_metrics.memory_percent,
+            'gpu_percent': current_metrics.gpu_percent,
+            'screen_brightness': current_metrics.screen_brightness,
+            'target_app_cpu': current_metrics.target_app_cpu,
+            'target_app_memory': current_metrics.target_app_memory
+        }
+    
+    def _optimizations_payload(self) -> List[Dict[str, Any]]:
+        """Build the /api/optimizations payload from the actuator's active actions"""
+        active_actions = self.agent_controller.actuator.get_active_actions()
+        
+        optimizations = []
+        for action_id, action_info in active_actions.items():
+            action = action_info['action']
+            result = action_info['result']
+            
+            optimizations.append({
+                'id': action_id,
+                'type': action.action_type,
+                'intensity': action.intensity,
+                'target': action.target_component,
+                'estimated_savings': action.estimated_savings,
+                'performance_impact': action.performance_impact,
+                'confidence': action.confidence,
+                'timestamp': action_info['timestamp'],
+                'success': result.success,
+                'previous_value': result.previous_value,
+                'new_value': result.new_value
+            })
+        
+        return optimizations
+    
+    def _rebuild_optimizations_cache(self):
+        """Re-serialize the active optimizations; they only change on apply/revert"""
+        self._store_cache('optimizations', _dumps(self._optimizations_payload()))
+    
+    def _memo(self, key: str, ttl: float, producer: Callable[[], bytes]) -> bytes:
+        """Return the producer's result, reusing it for ttl seconds"""
+        now = time.monotonic()
+        hit = self._ttl_cache.get(key)
+        if hit and now - hit[0] < ttl:
+            return hit[1]
+        
+        value = producer()
+        self._ttl_cache[key] = (now, value)
+        return value
+    
+    def _store_cache(self, key: str, body: bytes):
+        """Atomically replace a cached snapshot"""
+        with self._cache_lock:
+            self._cache[key] = body
+            self._cache.pop(key + '.gz', None)
+            self._cache_versions[key] = self._cache_versions.get(key, 0) + 1
+    
+    def _invalidate_cache(self, *keys: str):
+        """Drop cached snapshots so the next request rebuilds them, and push the change"""
+        with self._cache_lock:
+            for key in keys:
+                self._cache.pop(key, None)
+                self._cache.pop(key + '.gz', None)
+                self._cache_versions[key] = self._cache_versions.get(key, 0) + 1
+        
+        self._dirty.set()
+    
+    def _cached_json(self, key: str, producer: Callable[[], Any],
+                     compress: bool = False) -> Response:
+        """Serve a cached snapshot, building it (and its gzip variant) on first use
+        
+        The snapshot's version is sent as its ETag, so unchanged polls get a 304.
+        """
+        with self._cache_lock:
+            body = self._cache.get(key)
+            compressed = self._cache.get(key + '.gz')
+            version = self._cache_versions.get(key, 0)
+        
+        if body is None:
+            body = _dumps(producer())
+            with self._cache_lock:
+                self._cache[key] = body
+                version = self._cache_versions.get(key, 0) + 1
+                self._cache_versions[key] = version
+        
+        etag = f'{self._etag_prefix}-{key}-{version}'
+        if etag in request.if_none_match:
+            return _not_modified(etag)
+        
+        if not compress:
+            response = Response(body, mimetype='application/json')
+        elif not _accepts_gzip(body):
+            response = _vary_response(body)
+        else:
+            if compressed is None:
+                compressed = gzip.compress(body, compresslevel=_GZIP_LEVEL)
+                with self._cache_lock:
+                    # Only keep the variant if the plain body wasn't replaced meanwhile
+                    if self._cache.get(key) is body:
+                        self._cache[key + '.gz'] = compressed
+            response = _gzip_response(compressed)
+        
+        response.set_etag(etag)
+        return response
+    
+    @staticmethod
+    def _realtime_payload(values: Tuple[float, ...], state: Dict[str, Any],
+                          optimizations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Realtime update as a dict, in the same shape as _SSE_FRAME_TEMPLATE"""
+        timestamp, battery_percent, battery_power_draw, cpu_percent, memory_percent, gpu_percent = values
+        return {
+            'timestamp': timestamp,
+            'metrics': {
+                'battery_percent': battery_percent,
+                'battery_power_draw': battery_power_draw,
+                'cpu_percent': cpu_percent,
+                'memory_percent': memory_percent,
+                'gpu_percent': gpu_percent
+            },
+            'state': state,
+            'optimizations': optimizations
+        }
+    
+    def _sse_publisher(self):
+        """Coalesce metrics updates into at most one snapshot refresh and frame per window"""
+        while True:
+            self._dirty.wait()
+            time.sleep(_SSE_COALESCE_SECONDS)
+            self._dirty.clear()
+            
+            try:
+                # Refresh the API snapshots once per window instead of once per request
+                state = self.agent_controller.get_current_state()
+                state_json = _dumps(state)
+                self._store_cache('status', state_json)
+                self._store_cache('metrics', _dumps(self._metrics_payload()))
+                
+                with self._cache_lock:
+                    optimizations_json = self._cache.get('optimizations')
+                if optimizations_json is None:
+                    optimizations_json = _dumps(self._optimizations_payload())
+                    self._store_cache('optimizations', optimizations_json)
+                
+                # Control changes can mark the state dirty before the first sample arrives
+                if self._latest_metrics is not None:
+                    self._publish_realtime_frame(self._latest_metrics, state, state_json,
+                                                 optimizations_json)
+            except Exception as e:
+                self.logger.error(f"Realtime publisher error: {e}")
+    
+    def _stream_frames(self, fmt: str, keepalive: bytes):
+        """Yield published frames of one format to a single streaming client"""
+        # Each client holds only the newest frame; slow readers skip stale ones
+        frames = queue.Queue(maxsize=1)
+        
+        with self._subscribers_lock:
+            latest = self._latest_frames.get(fmt)
+            if latest:
+                frames.put_nowait(latest)
+            self._subscribers[fmt].append(frames)
+        
+        try:
+            while True:
+                try:
+                    frame = frames.get(timeout=5.0)
+                except queue.Empty:
+                    yield keepalive  # Keep idle connections open
+                    continue
+                
+                yield frame
+        finally:
+            with self._subscribers_lock:
+                self._subscribers[fmt].remove(frames)
+    
+    def _publish_realtime_frame(self, metrics, state: Dict[str, Any], state_json: bytes,
+                                optimizations_json: bytes):
+        """Serialize one realtime update and hand it to every streaming client
+        
+        state_json and optimizations_json are the already-encoded /api/status and
+        /api/optimizations snapshots, spliced into a fixed frame template so only
+        the float values are formatted here.
+        """
+        timestamp = time.time()
+        values = (
+            timestamp,
+            metrics.battery_percent,
+            metrics.battery_power_draw,
+            metrics.cpu_percent,
+            metrics.memory_percent,
+            metrics.gpu_percent
+        )
+        
+        if all(map(math.isfinite, values)):
+            latest = {'json': _SSE_FRAME_TEMPLATE % (values + (state_json, optimizations_json))}
+        else:
+            # NaN/inf have no JSON literal; let the encoder reject or map them
+            payload = self._realtime_payload(values, state, self._optimizations_payload())
+            latest = {'json': _SSE_PREFIX + _dumps(payload) + _SSE_SUFFIX}
+        
+        if MSGPACK_AVAILABLE and self._subscribers['msgpack']:
+            payload = self._realtime_payload(values, state, self._optimizations_payload())
+            # Single-precision floats are plenty for display and halve the float bytes
+            packed = msgpack.packb(payload, use_single_float=True, default=_json_default)
+            latest['msgpack'] = struct.pack('>I', len(packed)) + packed
+        
+        with self._subscribers_lock:
+            self._latest_frames = latest
+            for fmt, frame in latest.items():
+                for frames in self._subscribers[fmt]:
+                    try:
+                        frames.get_nowait()  # Drop the frame this client hasn't read yet
+                    except queue.Empty:
+                        pass
+                    frames.put_nowait(frame)
     
     def start(self, threaded=True, debug=False):
         """Start the web dashboard"""
         try:
-            # Create templates directory and basic template if they don't exist
-            self._ensure_templates_exist()
-            
             if threaded:
                 # Run in separate thread
                 def run_app():
-                    self.app.run(host=self.host, port=self.port, debug=debug, 
-                               use_reloader=False, threaded=True)
+                    self._serve(debug)
                 
                 dashboard_thread = threading.Thread(target=run_app, daemon=True)
                 dashboard_thread.start()
                 self.logger.info(f"📊 Dashboard started in thread at http://{self.host}:{self.port}")
             else:
                 # Run in main thread
-                self.app.run(host=self.host, port=self.port, debug=debug)
+                self._serve(debug, use_reloader=debug)
                 
         except Exception as e:
             self.logger.error(f"❌ Failed to start dashboard: {e}")
     
-    def _ensure_templates_exist(self):
-        """Create basic HTML template if it doesn't exist"""
-        templates_dir = Path(__file__).parent / 'templates'
-        templates_dir.mkdir(exist_ok=True)
-        
-        template_file = templates_dir / 'dashboard.html'
-        
-        if not template_file.exists():
-            html_content = '''<!DOCTYPE html>
+    def _serve(self, debug: bool, use_reloader: bool = False):
+        """Serve the app with waitress, or Flask's dev server for debugging"""
+        if WAITRESS_AVAILABLE and not debug:
+            # Long channel timeout keeps idle SSE connections open between frames
+            waitress.serve(self.app, host=self.host, port=self.port,
+                           threads=8, channel_timeout=120)
+        else:
+            if not debug:
+                self.logger.warning("waitress not available, using Flask development server")
+            self.app.run(host=self.host, port=self.port, debug=debug,
+                         use_reloader=use_reloader, threaded=True)
+
+# Dashboard page. It has no template variables, so it is encoded and gzipped once
+# at import and served straight from memory
+DASHBOARD_HTML = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Battery Optimization Dashboard</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
     <style>
         body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -407,11 +753,16 @@ class WebDashboard:
         .btn-warning { background: #f39c12; color: white; }
         .btn-danger { background: #e74c3c; color: white; }
         .btn:hover { transform: translateY(-2px); box-shadow: 0 4px 8px rgba(0,0,0,0.2); }
+        .btn:disabled { opacity: 0.6; cursor: not-allowed; transform: none; box-shadow: none; }
         .chart-container {
             position: relative;
             height: 300px;
             margin: 20px 0;
         }
+        .chart-container canvas { width: 100%; height: 100%; display: block; }
+        .chart-legend { text-align: center; font-size: 0.9em; color: #555; }
+        .chart-legend span { margin: 0 10px; }
+        .chart-legend i { display: inline-block; width: 24px; height: 3px; margin-right: 6px; vertical-align: middle; }
         .optimizations-list {
             max-height: 300px;
             overflow-y: auto;
@@ -518,10 +869,10 @@ class WebDashboard:
             <div class="card">
                 <h3>🎛️ Controls</h3>
                 <div class="controls">
-                    <button class="btn btn-success" onclick="resumeOptimization()">▶️ Resume</button>
-                    <button class="btn btn-warning" onclick="pauseOptimization()">⏸️ Pause</button>
-                    <button class="btn btn-primary" onclick="revertAll()">🔄 Revert All</button>
-                    <button class="btn btn-danger" onclick="emergencyRevert()">🚨 Emergency</button>
+                    <button class="btn btn-success" onclick="resumeOptimization(this)">▶️ Resume</button>
+                    <button class="btn btn-warning" onclick="pauseOptimization(this)">⏸️ Pause</button>
+                    <button class="btn btn-primary" onclick="revertAll(this)">🔄 Revert All</button>
+                    <button class="btn btn-danger" onclick="emergencyRevert(this)">🚨 Emergency</button>
                 </div>
                 <div class="form-group">
                     <label for="mode-select">Optimization Mode:</label>
@@ -538,6 +889,11 @@ class WebDashboard:
         <!-- Charts -->
         <div class="card">
             <h3>📈 Battery & Performance Trends</h3>
+            <div class="chart-legend">
+                <span><i style="background:#27ae60"></i>Battery %</span>
+                <span><i style="background:#3498db"></i>CPU %</span>
+                <span><i style="background:#e74c3c"></i>Power Draw (W)</span>
+            </div>
             <div class="chart-container">
                 <canvas id="metricsChart"></canvas>
             </div>
@@ -583,15 +939,24 @@ class WebDashboard:
     </div>
     
     <script>
-        let metricsChart;
+        let lastTs = null;
+        const CHART_MAX_POINTS = 300;
+        
+        // Chart samples live in fixed-size rings; head is the next slot to write
+        const chartSeries = [
+            { key: 'battery_percent', color: '#27ae60', buf: new Float32Array(CHART_MAX_POINTS) },
+            { key: 'cpu_percent', color: '#3498db', buf: new Float32Array(CHART_MAX_POINTS) },
+            { key: 'battery_power_draw', color: '#e74c3c', buf: new Float32Array(CHART_MAX_POINTS) }
+        ];
+        let chartHead = 0;
+        let chartCount = 0;
+        let chartCanvas, chartCtx;
         
         // Initialize dashboard
         document.addEventListener('DOMContentLoaded', function() {
             initializeChart();
             updateDashboard();
-            
-            // Update every 3 seconds
-            setInterval(updateDashboard, 3000);
+            startRealtime();
             
             // Satisfaction slider
             document.getElementById('satisfaction').oninput = function() {
@@ -600,51 +965,106 @@ class WebDashboard:
         });
         
         function initializeChart() {
-            const ctx = document.getElementById('metricsChart').getContext('2d');
-            metricsChart = new Chart(ctx, {
-                type: 'line',
-                data: {
-                    labels: [],
-                    datasets: [
-                        {
-                            label: 'Battery %',
-                            data: [],
-                            borderColor: '#27ae60',
-                            backgroundColor: 'rgba(39, 174, 96, 0.1)',
-                            tension: 0.4
-                        },
-                        {
-                            label: 'CPU %',
-                            data: [],
-                            borderColor: '#3498db',
-                            backgroundColor: 'rgba(52, 152, 219, 0.1)',
-                            tension: 0.4
-                        },
-                        {
-                            label: 'Power Draw (W)',
-                            data: [],
-                            borderColor: '#e74c3c',
-                            backgroundColor: 'rgba(231, 76, 60, 0.1)',
-                            tension: 0.4
-                        }
-                    ]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {
-                        y: {
-                            beginAtZero: true,
-                            max: 100
-                        }
-                    },
-                    plugins: {
-                        legend: {
-                            position: 'top',
-                        }
-                    }
+            chartCanvas = document.getElementById('metricsChart');
+            chartCtx = chartCanvas.getContext('2d');
+            resizeChart();
+            window.addEventListener('resize', resizeChart);
+        }
+        
+        function resizeChart() {
+            // Match the backing store to the displayed size so lines stay crisp
+            const ratio = window.devicePixelRatio || 1;
+            chartCanvas.width = chartCanvas.clientWidth * ratio;
+            chartCanvas.height = chartCanvas.clientHeight * ratio;
+            chartCtx.setTransform(ratio, 0, 0, ratio, 0, 0);
+            redrawChart();
+        }
+        
+        function redrawChart() {
+            const width = chartCanvas.clientWidth;
+            const height = chartCanvas.clientHeight;
+            const pad = 24;
+            const plotHeight = height - 2 * pad;
+            const step = (width - 2 * pad) / (CHART_MAX_POINTS - 1);
+            
+            chartCtx.clearRect(0, 0, width, height);
+            
+            // Fixed 0-100 scale with gridlines every 25
+            chartCtx.strokeStyle = '#eee';
+            chartCtx.fillStyle = '#999';
+            chartCtx.font = '10px sans-serif';
+            chartCtx.lineWidth = 1;
+            for (let v = 0; v <= 100; v += 25) {
+                const y = pad + plotHeight * (1 - v / 100);
+                chartCtx.beginPath();
+                chartCtx.moveTo(pad, y);
+                chartCtx.lineTo(width - pad, y);
+                chartCtx.stroke();
+                chartCtx.fillText(v, 2, y + 3);
+            }
+            
+            if (chartCount === 0) return;
+            
+            // Walk each ring oldest-to-newest in one pass
+            const start = (chartHead - chartCount + CHART_MAX_POINTS) % CHART_MAX_POINTS;
+            const x0 = pad + (CHART_MAX_POINTS - chartCount) * step;
+            chartCtx.lineWidth = 2;
+            for (const series of chartSeries) {
+                const buf = series.buf;
+                chartCtx.strokeStyle = series.color;
+                chartCtx.beginPath();
+                for (let i = 0; i < chartCount; i++) {
+                    const v = Math.min(Math.max(buf[(start + i) % CHART_MAX_POINTS], 0), 100);
+                    const x = x0 + i * step;
+                    const y = pad + plotHeight * (1 - v / 100);
+                    if (i === 0) chartCtx.moveTo(x, y); else chartCtx.lineTo(x, y);
                 }
-            });
+                chartCtx.stroke();
+            }
+        }
+        
+        // Live updates are pushed over server-sent events; fall back to polling
+        // every 3 seconds if the browser or server can't stream
+        let pollTimer = null;
+        
+        function startPolling() {
+            if (pollTimer === null) {
+                pollTimer = setInterval(updateDashboard, 3000);
+            }
+        }
+        
+        function startRealtime() {
+            if (!window.EventSource) {
+                startPolling();
+                return;
+            }
+            
+            const source = new EventSource('/api/realtime');
+            source.onmessage = event => applyRealtime(JSON.parse(event.data));
+            source.onerror = () => {
+                // The browser retries transient errors itself; CLOSED means it gave up
+                if (source.readyState === EventSource.CLOSED) startPolling();
+            };
+        }
+        
+        function applyRealtime(data) {
+            const state = data.state;
+            updateStatus(state);
+            updateOptimizations(data.optimizations);
+            
+            const metrics = state.current_metrics;
+            if (!metrics) return;
+            updateMetrics(metrics);
+            
+            // Each frame carries the latest sample; append it unless already charted
+            if (lastTs === null || metrics.timestamp > lastTs) {
+                updateChart({
+                    timestamp: [metrics.timestamp],
+                    battery_percent: [metrics.battery_percent],
+                    cpu_percent: [metrics.cpu_percent],
+                    battery_power_draw: [metrics.battery_power_draw]
+                });
+            }
         }
         
         async function updateDashboard() {
@@ -658,7 +1078,10 @@ class WebDashboard:
                 updateMetrics(metrics);
                 
                 // Update chart
-                const history = await fetch('/api/metrics/history?duration=300').then(r => r.json());
+                const historyUrl = lastTs === null
+                    ? '/api/metrics/history?duration=300'
+                    : `/api/metrics/history?duration=300&since=${lastTs}`;
+                const history = await fetch(historyUrl).then(r => r.json());
                 updateChart(history);
                 
                 // Update optimizations
@@ -695,23 +1118,31 @@ class WebDashboard:
         }
         
         function updateChart(history) {
-            if (!history || history.length === 0) return;
+            if (!history || !history.timestamp || history.timestamp.length === 0) return;
             
-            const labels = history.map(h => new Date(h.timestamp * 1000).toLocaleTimeString());
-            const batteryData = history.map(h => h.battery_percent);
-            const cpuData = history.map(h => h.cpu_percent);
-            const powerData = history.map(h => h.battery_power_draw);
+            // Write only the new samples; the ring overwrites the oldest ones
+            const count = history.timestamp.length;
+            for (const series of chartSeries) {
+                const column = history[series.key];
+                for (let i = 0; i < count; i++) {
+                    series.buf[(chartHead + i) % CHART_MAX_POINTS] = column[i];
+                }
+            }
+            chartHead = (chartHead + count) % CHART_MAX_POINTS;
+            chartCount = Math.min(chartCount + count, CHART_MAX_POINTS);
             
-            metricsChart.data.labels = labels;
-            metricsChart.data.datasets[0].data = batteryData;
-            metricsChart.data.datasets[1].data = cpuData;
-            metricsChart.data.datasets[2].data = powerData;
-            metricsChart.update('none');
+            lastTs = history.timestamp[count - 1];
+            redrawChart();
         }
         
         function updateOptimizations(optimizations) {
             const container = document.getElementById('optimizations-list');
             
+            // Skip the DOM rewrite when the list hasn't changed since the last render
+            const key = optimizations.map(o => o.id + '|' + o.timestamp).join(';');
+            if (key === container._lastKey) return;
+            container._lastKey = key;
+            
             if (optimizations.length === 0) {
                 container.innerHTML = '<p>No active optimizations</p>';
                 return;
@@ -737,46 +1168,45 @@ class WebDashboard:
             setTimeout(() => container.innerHTML = '', 3000);
         }
         
-        async function pauseOptimization() {
+        // Control POSTs: one request in flight per endpoint, plus a short cooldown,
+        // so repeated clicks collapse into a single server action
+        const controlBusy = {};
+        
+        async function postControl(endpoint, button, errorMessage) {
+            if (controlBusy[endpoint]) return;
+            controlBusy[endpoint] = true;
+            if (button) button.disabled = true;
+            
             try {
-                const response = await fetch('/api/control/pause', { method: 'POST' });
+                const response = await fetch(endpoint, { method: 'POST' });
                 const result = await response.json();
                 showMessage('control-messages', result.message, !result.success);
             } catch (error) {
-                showMessage('control-messages', 'Error pausing optimization', true);
+                showMessage('control-messages', errorMessage, true);
+            } finally {
+                setTimeout(() => {
+                    controlBusy[endpoint] = false;
+                    if (button) button.disabled = false;
+                }, 300);
             }
         }
         
-        async function resumeOptimization() {
-            try {
-                const response = await fetch('/api/control/resume', { method: 'POST' });
-                const result = await response.json();
-                showMessage('control-messages', result.message, !result.success);
-            } catch (error) {
-                showMessage('control-messages', 'Error resuming optimization', true);
-            }
+        function pauseOptimization(button) {
+            return postControl('/api/control/pause', button, 'Error pausing optimization');
         }
         
-        async function revertAll() {
-            try {
-                const response = await fetch('/api/control/revert_all', { method: 'POST' });
-                const result = await response.json();
-                showMessage('control-messages', result.message, !result.success);
-            } catch (error) {
-                showMessage('control-messages', 'Error reverting optimizations', true);
-            }
+        function resumeOptimization(button) {
+            return postControl('/api/control/resume', button, 'Error resuming optimization');
+        }
+        
+        function revertAll(button) {
+            return postControl('/api/control/revert_all', button, 'Error reverting optimizations');
         }
         
-        async function emergencyRevert() {
+        function emergencyRevert(button) {
+            if (controlBusy['/api/control/emergency_revert']) return;
             if (!confirm('Emergency revert all optimizations?')) return;
-            
-            try {
-                const response = await fetch('/api/control/emergency_revert', { method: 'POST' });
-                const result = await response.json();
-                showMessage('control-messages', result.message, !result.success);
-            } catch (error) {
-                showMessage('control-messages', 'Error in emergency revert', true);
-            }
+            return postControl('/api/control/emergency_revert', button, 'Error in emergency revert');
         }
         
         async function setOptimizationMode() {
@@ -825,11 +1255,20 @@ class WebDashboard:
     </script>
 </body>
 </html>'''
-            
-            with open(template_file, 'w') as f:
-                f.write(html_content)
-            
-            self.logger.info("📄 Created dashboard template")
+
+_TEMPLATE_BYTES = DASHBOARD_HTML.encode('utf-8')
+_TEMPLATE_GZ = gzip.compress(_TEMPLATE_BYTES, compresslevel=9, mtime=0)
+
+def _load_brotli_asset() -> Optional[bytes]:
+    """Read the prebuilt Brotli page, ignoring it if it is older than this module"""
+    try:
+        if BROTLI_ASSET.stat().st_mtime >= Path(__file__).stat().st_mtime:
+            return BROTLI_ASSET.read_bytes()
+    except OSError:
+        pass
+    return None
+
+_TEMPLATE_BR = _load_brotli_asset()
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Frame synthesis for the visual video demos
+Renders the animated sine gradient used as sample video content
+"""
+
+import functools
+import math
+from collections import namedtuple
+import numpy as np
+
+# Try to import the JIT compiler (optional); without it frames are rendered with NumPy
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Identity stand-in for numba.njit"""
+        return lambda func: func
+
+# Try to import CuPy (optional); with a CUDA device present, frames are synthesized on the GPU
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = True
+except ImportError:
+    CUPY_AVAILABLE = False
+
+# The full-frame (blue) band is computed in int16 fixed point: the column
+# factors are scaled by 2**FIXED_SHIFT and the per-frame row factors by the
+# amplitude 127, so each product fits in int16 and a shift restores the scale;
+# rounding can push the extremes one step past 0..255, hence the clamp
+FIXED_SHIFT = 7
+FIXED_ONE = 1 << FIXED_SHIFT
+
+# The NumPy path works through the frame in row strips whose int16 scratch
+# fits comfortably in L2, instead of making whole-frame passes
+STRIP_BYTES = 128 * 1024
+
+def dim_color(color, brightness):
+    """Scale a BGR color for drawing onto a frame rendered at this brightness"""
+    return tuple(int(channel * brightness) for channel in color)
+
+@njit('void(uint8[:, :, ::1], uint8[::1], uint8[::1], int16[::1], int16[::1], int16[::1], int16[::1], int64)',
+      parallel=True, fastmath=True, cache=True)
+def _fill_gradient(frame, red, green, sin_u, cos_u, siny_half, cosy_half, offset):
+    """Fused gradient kernel: every pixel written once, rows split across cores"""
+    height, width = frame.shape[0], frame.shape[1]
+    for y in prange(height):
+        g = green[y]
+        cy, sy = cosy_half[y], siny_half[y]
+        for x in range(width):
+            b = offset + ((cy * sin_u[x] + sy * cos_u[x]) >> FIXED_SHIFT)
+            frame[y, x, 0] = np.uint8(min(max(b, 0), 255))
+            frame[y, x, 1] = g
+            frame[y, x, 2] = red[x]
+
+PhaseTables = namedtuple('PhaseTables',
+                         'sinx cosx siny cosy sinx_half cosx_half siny_half cosy_half')
+
+@functools.lru_cache(maxsize=8)
+def phase_tables(width, height, k):
+    """Precompute sin/cos of the spatial phases for a frame size and frequency k"""
+    k = np.float32(k)
+    phase_x = np.arange(width, dtype=np.float32) * k
+    phase_y = np.arange(height, dtype=np.float32) * k
+    
+    # The diagonal band is separable: sin(t + h*x + h*y) expands over the
+    # half-phase row and column terms, so no height x width table is needed
+    return PhaseTables(
+        sinx=np.sin(phase_x), cosx=np.cos(phase_x),
+        siny=np.sin(phase_y), cosy=np.cos(phase_y),
+        sinx_half=np.sin(phase_x / 2), cosx_half=np.cos(phase_x / 2),
+        siny_half=np.rint(np.sin(phase_y / 2) * FIXED_ONE).astype(np.int16),
+        cosy_half=np.rint(np.cos(phase_y / 2) * FIXED_ONE).astype(np.int16),
+    )
+
+@functools.lru_cache(maxsize=None)
+def gpu_available():
+    """Whether CuPy is installed and can see a CUDA device, probed once"""
+    if not CUPY_AVAILABLE:
+        return False
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except cp.cuda.runtime.CUDARuntimeError:
+        return False
+
+if CUPY_AVAILABLE:
+    # Same per-pixel math as _fill_gradient, one GPU thread per output byte
+    _gpu_fill_gradient = cp.ElementwiseKernel(
+        'raw uint8 red, raw uint8 green, raw int16 sin_u, raw int16 cos_u, '
+        'raw int16 siny_half, raw int16 cosy_half, int32 offset, int32 width',
+        'uint8 out',
+        '''
+        int px = i / 3, channel = i % 3;
+        int x = px % width, y = px / width;
+        if (channel == 0) {
+            int b = offset + ((cosy_half[y] * sin_u[x] + siny_half[y] * cos_u[x]) >> FIXED_SHIFT);
+            out = min(max(b, 0), 255);
+        } else if (channel == 1) {
+            out = green[y];
+        } else {
+            out = red[x];
+        }
+        ''',
+        'gradient_fill',
+        preamble=f'#define FIXED_SHIFT {FIXED_SHIFT}')
+
+class GradientRenderer:
+    """Animated BGR sine gradient with per-size trig tables
+    
+    Channel values follow 128 + 127*sin(t + k*x) (red), 128 + 127*sin(t + k*y)
+    (green) and 128 + 127*sin(t + k*(x+y)/2) (blue), where t = frame_num*time_step.
+    The angle-addition identity turns each frame into scalar trig plus multiplies
+    against tables built once per frame size (phase_tables keeps the last few
+    sizes, so quality switches reuse them). Tables are float32, and the
+    full-frame band is assembled in int16 fixed point. Brightness scales the
+    offset and amplitude, so dimming costs no extra pass over the frame.
+    """
+    
+    def __init__(self, time_step, spatial_step, use_gpu=None):
+        self.time_step = time_step
+        self.spatial_step = spatial_step
+        self._key = None
+        self._tables = None
+        
+        # GPU rendering (None picks it whenever a CUDA device is usable); the
+        # column tables and output frame live on the device between frames
+        self.use_gpu = gpu_available() if use_gpu is None else (use_gpu and gpu_available())
+        self._gpu_tables = None
+        self._gpu_frame = None
+        
+        # Scratch planes for the NumPy path, reallocated when the size changes
+        self._band = None
+        self._scratch = None
+    
+    def render(self, frame, frame_num, scale=1.0, brightness=1.0):
+        """Write the gradient for frame_num into frame (height x width x 3 uint8)
+        
+        scale is the size of one frame pixel in pattern pixels, so a frame
+        rendered at half resolution with scale=2 shows the same picture.
+        """
+        height, width = frame.shape[:2]
+        key = (width, height, self.spatial_step * scale)
+        if self._key != key:
+            self._tables = phase_tables(*key)
+            self._gpu_tables = None
+            self._key = key
+        tables = self._tables
+        
+        t = frame_num * self.time_step
+        s, c = np.float32(math.sin(t)), np.float32(math.cos(t))
+        offset = np.float32(128 * brightness)
+        amplitude = np.float32(127 * brightness)
+        
+        # Red varies along x, green along y: one uint8 row/column each
+        red = (offset + amplitude * (s * tables.cosx + c * tables.sinx)).astype(np.uint8)
+        green = (offset + amplitude * (s * tables.cosy + c * tables.siny)).astype(np.uint8)
+        
+        # Blue: sin(u + h*y) with u = t + h*x, i.e. sin(u)cos(h*y) + cos(u)sin(h*y)
+        sin_u = np.rint(amplitude * (s * tables.cosx_half + c * tables.sinx_half)).astype(np.int16)
+        cos_u = np.rint(amplitude * (c * tables.cosx_half - s * tables.sinx_half)).astype(np.int16)
+        offset = int(offset)
+        
+        if self.use_gpu:
+            return self._render_gpu(frame, tables, red, green, sin_u, cos_u, offset)
+        
+        if NUMBA_AVAILABLE and frame.flags.c_contiguous:
+            _fill_gradient(frame, red, green, sin_u, cos_u, tables.siny_half, tables.cosy_half, offset)
+            return frame
+        
+        rows = max(1, STRIP_BYTES // (2 * width))
+        if self._band is None or self._band.shape != (rows, width):
+            self._band = np.empty((rows, width), dtype=np.int16)
+            self._scratch = np.empty((rows, width), dtype=np.int16)
+        
+        for y0 in range(0, height, rows):
+            y1 = min(y0 + rows, height)
+            strip = frame[y0:y1]
+            band, scratch = self._band[:y1 - y0], self._scratch[:y1 - y0]
+            np.multiply(tables.cosy_half[y0:y1, None], sin_u, out=band)
+            np.multiply(tables.siny_half[y0:y1, None], cos_u, out=scratch)
+            band += scratch
+            band >>= FIXED_SHIFT
+            band += offset
+            np.clip(band, 0, 255, out=band)
+            strip[:, :, 0] = band
+            strip[:, :, 1] = green[y0:y1, None]
+            strip[:, :, 2] = red
+        return frame
+    
+    def _render_gpu(self, frame, tables, red, green, sin_u, cos_u, offset):
+        """Run the fill on the GPU, uploading the per-frame rows and downloading the frame"""
+        width = frame.shape[1]
+        if self._gpu_tables is None:
+            self._gpu_tables = (cp.asarray(tables.siny_half), cp.asarray(tables.cosy_half))
+        if self._gpu_frame is None or self._gpu_frame.shape != frame.shape:
+            self._gpu_frame = cp.empty(frame.shape, dtype=cp.uint8)
+        
+        siny_half, cosy_half = self._gpu_tables
+        _gpu_fill_gradient(cp.asarray(red), cp.asarray(green), cp.asarray(sin_u), cp.asarray(cos_u),
+                           siny_half, cosy_half, np.int32(offset), np.int32(width), self._gpu_frame)
+        if frame.flags.c_contiguous:
+            self._gpu_frame.get(out=frame)
+        else:
+            frame[...] = self._gpu_frame.get()
+        return frame
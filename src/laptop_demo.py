@@ -4,7 +4,8 @@ Laptop-specific demo for visual battery optimization results
 """
 
 import sys
-import time
+import signal
+import threading
 import psutil
 from pathlib import Path
 
@@ -14,20 +15,66 @@ sys.path.append(str(Path(__file__).parent))
 from core.monitoring import SystemMonitor
 from core.reasoning import BatteryOptimizationAgent
 from core.actions import OptimizationActuator
-from demo_app.video_player import VideoPlayerDemo
+from utils.cache import ttl_cached
+from utils.shutdown import wait_for_interrupt
+
+# Battery state changes over seconds; don't hit sysfs/WMI on every call
+sensors_battery = ttl_cached(5.0)(psutil.sensors_battery)
+
+# Laptop state report, formatted in one pass per cycle
+STATE_TEMPLATE = (
+    "\n📊 CURRENT LAPTOP STATE\n" + "-" * 40 + "\n"
+    "{battery}"
+    "💻 CPU: {cpu:.1f}%\n"
+    "💾 Memory: {memory:.1f}%\n"
+    "💡 Screen Brightness: {brightness}%\n"
+    "⚡ Power Draw: {power:.1f}W\n"
+)
+BATTERY_TEMPLATE = "🔋 Battery: {percent:.1f}%\n⚡ Plugged In: {plugged}\n"
+TIME_LEFT_TEMPLATE = "⏰ Time Remaining: {hours:.1f} hours\n"
+
+# Static banners are encoded for the console once, at import
+_STDOUT_ENCODING = getattr(sys.stdout, 'encoding', None) or 'utf-8'
+_BANNER = (
+    "💻 LAPTOP BATTERY OPTIMIZATION DEMO\n"
+    + "=" * 60 + "\n"
+    "🔋 For best results:\n"
+    "   1. UNPLUG your laptop charger\n"
+    "   2. Set screen brightness to 80-100%\n"
+    "   3. Close unnecessary programs\n"
+    "   4. Watch REAL optimizations happen!\n"
+    "\n"
+).encode(_STDOUT_ENCODING, errors='replace')
+_OPTIONS_MENU = (
+    "\n💻 LAPTOP DEMO OPTIONS:\n"
+    "1. 🔋 Real-time Battery Monitoring (2 minutes)\n"
+    "2. 🎥 Video Streaming Test (3 minutes)\n"
+    "3. 📊 Before/After Comparison\n"
+    "4. 🌐 Web Dashboard + Manual Testing\n"
+    "5. ❌ Exit\n"
+).encode(_STDOUT_ENCODING, errors='replace')
+
+def _write_encoded(data: bytes):
+    """Write pre-encoded bytes straight to the console buffer"""
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:
+        # Replaced stdout (IDE consoles, captured output) without a byte layer
+        sys.stdout.write(data.decode(_STDOUT_ENCODING, errors='replace'))
+        sys.stdout.flush()
+        return
+    # Flush pending text first so output stays in order
+    sys.stdout.flush()
+    buffer.write(data)
+    buffer.flush()
 
 class LaptopDemo:
     """Laptop-specific demonstration with visual feedback"""
     
     def __init__(self):
-        print("💻 LAPTOP BATTERY OPTIMIZATION DEMO")
-        print("=" * 60)
-        print("🔋 For best results:")
-        print("   1. UNPLUG your laptop charger")
-        print("   2. Set screen brightness to 80-100%")
-        print("   3. Close unnecessary programs")
-        print("   4. Watch REAL optimizations happen!")
-        print()
+        # Set to end a running test at its next wait
+        self._stop = threading.Event()
+        
+        _write_encoded(_BANNER)
         
         confirm = input("📱 Is your laptop unplugged and ready? (y/N): ").strip().lower()
         if confirm not in ['y', 'yes']:
@@ -37,32 +84,57 @@ class LaptopDemo:
         self.monitor = SystemMonitor()
         self.agent = BatteryOptimizationAgent()
         self.actuator = OptimizationActuator()
-        self.video_player = VideoPlayerDemo()
+        self._video_player = None
+        
+        # Repeated reads within one monitoring cycle reuse the same sample
+        self._collect_metrics = ttl_cached(2.0)(self.monitor.collect_metrics)
         
         print("\n✅ System initialized - Starting real laptop demo!")
     
-    def show_current_laptop_state(self):
-        """Show current laptop battery and power state"""
-        print("\n📊 CURRENT LAPTOP STATE")
-        print("-" * 40)
+    @property
+    def video_player(self):
+        """Video player demo, created on first use (pulls in OpenCV)"""
+        if self._video_player is None:
+            from demo_app.video_player import VideoPlayerDemo
+            self._video_player = VideoPlayerDemo()
+        return self._video_player
+    
+    def stop(self):
+        """Ask the running test to finish at its next wait"""
+        self._stop.set()
+    
+    def show_current_laptop_state(self, verbose: bool = True, metrics=None):
+        """Show current laptop battery and power state, reusing ``metrics`` if given"""
+        battery = sensors_battery()
+        if metrics is None:
+            metrics = self._collect_metrics()
         
-        battery = psutil.sensors_battery()
-        metrics = self.monitor.collect_metrics()
+        if verbose:
+            # One write per report instead of one per line
+            sys.stdout.write(self.format_laptop_state(battery, metrics))
+            sys.stdout.flush()
         
+        return battery, metrics
+    
+    @staticmethod
+    def format_laptop_state(battery, metrics) -> str:
+        """Render the laptop state report as a single string"""
+        battery_text = ""
         if battery:
-            print(f"🔋 Battery: {battery.percent:.1f}%")
-            print(f"⚡ Plugged In: {'Yes' if battery.power_plugged else 'No (GOOD!)'}")
-            if not battery.power_plugged:
-                hours_left = battery.secsleft / 3600 if battery.secsleft != psutil.POWER_TIME_UNLIMITED else "Unknown"
-                if isinstance(hours_left, float):
-                    print(f"⏰ Time Remaining: {hours_left:.1f} hours")
-        
-        print(f"💻 CPU: {metrics.cpu_percent:.1f}%")
-        print(f"💾 Memory: {metrics.memory_percent:.1f}%")
-        print(f"💡 Screen Brightness: {metrics.screen_brightness}%")
-        print(f"⚡ Power Draw: {metrics.battery_power_draw:.1f}W")
+            battery_text = BATTERY_TEMPLATE.format(
+                percent=battery.percent,
+                plugged='Yes' if battery.power_plugged else 'No (GOOD!)'
+            )
+            if not battery.power_plugged and battery.secsleft != psutil.POWER_TIME_UNLIMITED:
+                battery_text += TIME_LEFT_TEMPLATE.format(hours=battery.secsleft / 3600)
         
-        return battery, metrics
+        return STATE_TEMPLATE.format(
+            battery=battery_text,
+            cpu=metrics.cpu_percent,
+            memory=metrics.memory_percent,
+            brightness=metrics.screen_brightness,
+            power=metrics.battery_power_draw
+        )
     
     def run_visual_battery_test(self):
         """Run test with visual feedback on laptop"""
@@ -80,46 +152,56 @@ class LaptopDemo:
         print("💡 You should see ACTUAL changes to your laptop!")
         
         for cycle in range(12):  # 2 minutes of monitoring
-            print(f"\n--- Cycle {cycle + 1}/12 ---")
-            
-            battery, metrics = self.show_current_laptop_state()
+            battery, metrics = self.show_current_laptop_state(verbose=False)
+            sys.stdout.write(f"\n--- Cycle {cycle + 1}/12 ---\n" + self.format_laptop_state(battery, metrics))
+            sys.stdout.flush()
             
             # Get optimization decisions
             actions = self.agent.decide_optimization(metrics)
             
+            # Collect the cycle's report and write it once
+            lines = []
             if actions:
-                print(f"\n🤖 APPLYING {len(actions)} REAL OPTIMIZATIONS:")
+                lines.append(f"\n🤖 APPLYING {len(actions)} REAL OPTIMIZATIONS:")
                 
                 # Apply actual optimizations
                 results = self.actuator.apply_actions(actions)
                 
+                # Count and total the successful actions while reporting them
+                applied = 0
+                total_savings = 0.0
                 for i, (action, result) in enumerate(zip(actions, results), 1):
                     if result.success:
-                        print(f"   ✅ {i}. {action.action_type}")
-                        print(f"      Intensity: {action.intensity:.2f}")
-                        print(f"      Expected Savings: {action.estimated_savings:.1f}%")
+                        applied += 1
+                        total_savings += action.estimated_savings
+                        lines.append(f"   ✅ {i}. {action.action_type}")
+                        lines.append(f"      Intensity: {action.intensity:.2f}")
+                        lines.append(f"      Expected Savings: {action.estimated_savings:.1f}%")
                         
                         if action.action_type == "brightness_adjust":
-                            print(f"      👀 WATCH: Your screen should get dimmer!")
+                            lines.append(f"      👀 WATCH: Your screen should get dimmer!")
                         elif action.action_type == "cpu_throttle":
-                            print(f"      🐌 CPU frequency reduced for power savings")
+                            lines.append(f"      🐌 CPU frequency reduced for power savings")
                         
                     else:
-                        print(f"   ❌ {i}. {action.action_type} - {result.error_message}")
+                        lines.append(f"   ❌ {i}. {action.action_type} - {result.error_message}")
                 
                 # Show the impact
-                print(f"\n📈 OPTIMIZATION IMPACT:")
-                successful_optimizations = [r for r in results if r.success]
-                if successful_optimizations:
-                    total_savings = sum(action.estimated_savings for action, result in zip(actions, results) if result.success)
-                    print(f"   💡 Applied {len(successful_optimizations)} optimizations")
-                    print(f"   🔋 Estimated battery extension: {total_savings:.1f}%")
-                    print(f"   👀 VISUAL: Check if screen brightness changed!")
+                lines.append(f"\n📈 OPTIMIZATION IMPACT:")
+                if applied:
+                    lines.append(f"   💡 Applied {applied} optimizations")
+                    lines.append(f"   🔋 Estimated battery extension: {total_savings:.1f}%")
+                    lines.append(f"   👀 VISUAL: Check if screen brightness changed!")
                 
             else:
-                print(f"\n✅ No optimizations needed - laptop is efficient")
+                lines.append(f"\n✅ No optimizations needed - laptop is efficient")
             
-            time.sleep(10)
+            lines.append("")
+            sys.stdout.write("\n".join(lines))
+            sys.stdout.flush()
+            
+            if self._stop.wait(10):
+                break
     
     def run_video_streaming_laptop_test(self):
         """Test video streaming with real optimizations"""
@@ -134,7 +216,9 @@ class LaptopDemo:
             for minute in range(3):  # 3 minutes of video
                 print(f"\n🎥 Video Minute {minute + 1}/3")
                 
-                battery, metrics = self.show_current_laptop_state()
+                # One metrics sample per minute drives both the report and the decision
+                metrics = self._collect_metrics()
+                self.show_current_laptop_state(metrics=metrics)
                 
                 # Get current video stats
                 video_stats = self.video_player.get_current_stats()
@@ -164,7 +248,8 @@ class LaptopDemo:
                             print(f"   Frame Rate: {video_stats['settings']['frame_rate']} → {new_stats['settings']['frame_rate']} fps")
                             print(f"   👀 WATCH: Video quality should be lower but still watchable!")
                 
-                time.sleep(20)  # 20 seconds per "minute"
+                if self._stop.wait(20):  # 20 seconds per "minute"
+                    break
                 
         finally:
             self.video_player.stop_playback()
@@ -183,18 +268,24 @@ class LaptopDemo:
         
         if actions:
             results = self.actuator.apply_actions(actions)
-            time.sleep(3)  # Wait for changes to take effect
+            if self._stop.wait(3):  # Wait for changes to take effect
+                return
             
             print(f"\nAFTER optimization:")
             battery_after, metrics_after = self.show_current_laptop_state()
             
-            print(f"\n📈 CHANGES:")
-            if metrics_before.screen_brightness != metrics_after.screen_brightness:
-                print(f"   💡 Brightness: {metrics_before.screen_brightness}% → {metrics_after.screen_brightness}%")
-            if abs(metrics_before.cpu_percent - metrics_after.cpu_percent) > 2:
-                print(f"   💻 CPU: {metrics_before.cpu_percent:.1f}% → {metrics_after.cpu_percent:.1f}%")
-            if abs(metrics_before.battery_power_draw - metrics_after.battery_power_draw) > 0.5:
-                print(f"   ⚡ Power: {metrics_before.battery_power_draw:.1f}W → {metrics_after.battery_power_draw:.1f}W")
+            bright_before, bright_after = metrics_before.screen_brightness, metrics_after.screen_brightness
+            cpu_before, cpu_after = metrics_before.cpu_percent, metrics_after.cpu_percent
+            power_before, power_after = metrics_before.battery_power_draw, metrics_after.battery_power_draw
+            
+            lines = ["", "📈 CHANGES:"]
+            if bright_before != bright_after:
+                lines.append(f"   💡 Brightness: {bright_before}% → {bright_after}%")
+            if abs(cpu_before - cpu_after) > 2:
+                lines.append(f"   💻 CPU: {cpu_before:.1f}% → {cpu_after:.1f}%")
+            if abs(power_before - power_after) > 0.5:
+                lines.append(f"   ⚡ Power: {power_before:.1f}W → {power_after:.1f}W")
+            print("\n".join(lines))
         
         else:
             print("No optimizations applied - system already efficient")
@@ -202,15 +293,13 @@ class LaptopDemo:
 def main():
     demo = LaptopDemo()
     
-    print("\n💻 LAPTOP DEMO OPTIONS:")
-    print("1. 🔋 Real-time Battery Monitoring (2 minutes)")
-    print("2. 🎥 Video Streaming Test (3 minutes)")
-    print("3. 📊 Before/After Comparison")
-    print("4. 🌐 Web Dashboard + Manual Testing")
-    print("5. ❌ Exit")
+    _write_encoded(_OPTIONS_MENU)
     
     choice = input("\nSelect option (1-5): ").strip()
     
+    # Ctrl+C ends a running test cleanly instead of interrupting it mid-action
+    signal.signal(signal.SIGINT, lambda signum, frame: demo.stop())
+    
     if choice == "1":
         demo.run_visual_battery_test()
     elif choice == "2":
@@ -230,17 +319,19 @@ def main():
         from core.agent_controller import AgentController
         from dashboard.web_dashboard import WebDashboard
         
-        controller = AgentController()
+        # Share the demo's components so only one monitor polls the system
+        controller = AgentController(
+            monitor=getattr(demo, 'monitor', None),
+            agent=getattr(demo, 'agent', None),
+            actuator=getattr(demo, 'actuator', None)
+        )
         controller.start()
         
         dashboard = WebDashboard(controller)
         dashboard.start(threaded=True)
         
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            controller.stop()
+        wait_for_interrupt()
+        controller.stop()
     
     elif choice == "5":
         print("👋 Goodbye!")
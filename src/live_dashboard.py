@@ -3,13 +3,38 @@
 Live Dashboard - Simple version that works without complex dependencies
 """
 
-from flask import Flask, render_template_string, jsonify
+from flask import Flask, Response, request
+import argparse
+import asyncio
+import gzip
+import hashlib
+import math
+import os
 import psutil
-import time
 import threading
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import json
 
+import numpy as np
+
+from utils.cache import ttl_cached
+
+# Try to import the fast JSON encoder (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Try to import the production WSGI server (optional)
+try:
+    import waitress
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
 app = Flask(__name__)
 
 # Global data for the dashboard
@@ -23,15 +48,8 @@ live_data = {
     'status': 'Active'
 }
 
-# Beautiful HTML template
-DASHBOARD_TEMPLATE = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>🔋 Live Battery Optimization Dashboard</title>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <style>
+# Stylesheet and script are served as separate cacheable assets
+DASHBOARD_STYLE = """
         * { margin: 0; padding: 0; box-sizing: border-box; }
         
         body { 
@@ -211,7 +229,66 @@ DASHBOARD_TEMPLATE = """
             .metric-value { font-size: 2.5rem; }
             .container { padding: 15px; }
         }
-    </style>
+"""
+
+DASHBOARD_SCRIPT = """
+        function render(data) {
+            // Update metrics
+            document.getElementById('battery-value').textContent = data.battery + '%';
+            document.getElementById('cpu-value').textContent = data.cpu + '%';
+            document.getElementById('memory-value').textContent = data.memory + '%';
+            document.getElementById('power-value').textContent = data.power;
+            document.getElementById('timestamp').textContent = data.timestamp;
+            
+            // Update actions
+            const container = document.getElementById('actions-container');
+            if (data.actions && data.actions.length > 0) {
+                container.innerHTML = data.actions.map(action => 
+                    `<div class="action-item">✅ ${action}</div>`
+                ).join('');
+            }
+        }
+        
+        function updateDashboard() {
+            fetch('/api/live-data')
+                .then(response => response.json())
+                .then(render)
+                .catch(error => {
+                    console.log('Fetching live data...', error);
+                });
+        }
+        
+        // Fallback: poll every 2 seconds when push updates are unavailable
+        let pollTimer = null;
+        function startPolling() {
+            if (pollTimer) return;
+            pollTimer = setInterval(updateDashboard, 2000);
+            updateDashboard(); // Initial load
+            document.getElementById('update-time').textContent = 'Updating every 2 seconds';
+        }
+        
+        if (window.EventSource) {
+            // The server pushes a snapshot only when the data changes
+            const source = new EventSource('/api/stream');
+            source.onmessage = e => render(JSON.parse(e.data));
+            source.onerror = () => {
+                if (source.readyState === EventSource.CLOSED) startPolling();
+            };
+            document.getElementById('update-time').textContent = 'Live updates';
+        } else {
+            startPolling();
+        }
+"""
+
+# Beautiful HTML template
+DASHBOARD_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>🔋 Live Battery Optimization Dashboard</title>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <link rel="stylesheet" href="/assets/live_dashboard.css">
 </head>
 <body>
     <div class="container">
@@ -277,116 +354,314 @@ DASHBOARD_TEMPLATE = """
         </div>
     </div>
 
-    <script>
-        function updateDashboard() {
-            fetch('/api/live-data')
-                .then(response => response.json())
-                .then(data => {
-                    // Update metrics
-                    document.getElementById('battery-value').textContent = data.battery + '%';
-                    document.getElementById('cpu-value').textContent = data.cpu + '%';
-                    document.getElementById('memory-value').textContent = data.memory + '%';
-                    document.getElementById('power-value').textContent = data.power;
-                    document.getElementById('timestamp').textContent = data.timestamp;
-                    
-                    // Update actions
-                    const container = document.getElementById('actions-container');
-                    if (data.actions && data.actions.length > 0) {
-                        container.innerHTML = data.actions.map(action => 
-                            `<div class="action-item">✅ ${action}</div>`
-                        ).join('');
-                    }
-                })
-                .catch(error => {
-                    console.log('Fetching live data...', error);
-                });
-        }
-        
-        // Update every 2 seconds for truly live experience
-        setInterval(updateDashboard, 2000);
-        updateDashboard(); // Initial load
-        
-        // Add some visual feedback
-        document.getElementById('update-time').textContent = 'Updating every 2 seconds';
-    </script>
+    <script src="/assets/live_dashboard.js"></script>
 </body>
 </html>
 """
 
+def _static_asset(text: str, mimetype: str):
+    """Encode and gzip a static asset once: (mimetype, body, gzipped body, etag)"""
+    body = text.encode('utf-8')
+    return (mimetype, body, gzip.compress(body, 9, mtime=0),
+            hashlib.blake2b(body, digest_size=8).hexdigest())
+
+# Nothing on the page is templated, so it's all encoded once at import
+_INDEX = _static_asset(DASHBOARD_TEMPLATE, 'text/html')
+_STYLE = _static_asset(DASHBOARD_STYLE, 'text/css')
+_SCRIPT = _static_asset(DASHBOARD_SCRIPT, 'application/javascript')
+
+def _serve_asset(asset) -> Response:
+    """Serve a pre-encoded asset, gzipped when accepted, with ETag revalidation"""
+    mimetype, body, compressed, etag = asset
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    elif request.accept_encodings['gzip'] > 0:
+        response = Response(compressed, mimetype=mimetype, direct_passthrough=True)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(body, mimetype=mimetype, direct_passthrough=True)
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
 @app.route('/')
 def dashboard():
-    return render_template_string(DASHBOARD_TEMPLATE)
+    return _serve_asset(_INDEX)
+
+@app.route('/assets/live_dashboard.css')
+def dashboard_style():
+    return _serve_asset(_STYLE)
+
+@app.route('/assets/live_dashboard.js')
+def dashboard_script():
+    return _serve_asset(_SCRIPT)
 
 @app.route('/api/live-data')
 def get_live_data():
-    return jsonify(live_data)
+    # The sampler serializes once per update; requests only hand out the bytes
+    body, etag = _snapshot
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+@app.route('/api/stream')
+def stream_live_data():
+    """Push live_data to the browser as Server-Sent Events whenever it changes"""
+    def generate():
+        version = -1
+        while True:
+            with live_data_changed:
+                live_data_changed.wait_for(lambda: _live_version != version, timeout=STREAM_KEEPALIVE)
+                if _live_version == version:
+                    payload = None
+                else:
+                    version = _live_version
+                    payload = _snapshot[0]
+            
+            # Comment frames keep idle connections from being dropped by proxies
+            yield b"data: " + payload + b"\n\n" if payload is not None else b": keepalive\n\n"
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# Per-metric poll cadences in seconds; battery moves far slower than CPU
+POLL = {'cpu': 2.0, 'memory': 2.0, 'battery': 30.0, 'actions': 20.0}
+POLL_MIN, POLL_MAX = 1.0, 120.0
+POLL_ENV_VAR = 'LIVE_DASHBOARD_POLL'
+
+# Last raw sample per metric; power is derived from these on each update
+_samples = {'battery': 85.0, 'cpu': 0.0, 'memory': 0.0}
+_FALLBACK_SAMPLES = {'battery': 75.0, 'cpu': 45.2, 'memory': 62.1}
+
+# Linear power model: watts = bias + weights . [samples]; extend both together
+POWER_INPUTS = ('cpu', 'memory')
+POWER_WEIGHTS = np.array([0.15, 0.05], dtype=np.float64)
+POWER_BIAS = 8.0
+
+# Serializes writers only; readers take the current dict/snapshot without locking
+live_data_lock = threading.Lock()
+
+# Bumped (and waiters notified) whenever a displayed value changes
+live_data_changed = threading.Condition(live_data_lock)
+_live_version = 0
+STREAM_KEEPALIVE = 15.0  # seconds between SSE keepalive comments
+
+def _dumps(obj) -> bytes:
+    """Encode an object as JSON bytes, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+def _serialize(data):
+    """Pre-encoded JSON body and its ETag"""
+    body = _dumps(data)
+    return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+
+# (body, etag) of live_data, swapped as one tuple on every update
+_snapshot = _serialize(live_data)
+
+# Battery state changes over seconds; don't hit sysfs/WMI on every sample
+sensors_battery = ttl_cached(5.0)(psutil.sensors_battery)
+
+def load_poll_intervals(config_path=None):
+    """Resolve poll intervals from defaults, config file and environment.
+    
+    The config file may carry ``dashboard.poll_intervals``; the
+    ``LIVE_DASHBOARD_POLL`` environment variable (a JSON object) overrides
+    it. Every interval is clamped to [POLL_MIN, POLL_MAX].
+    """
+    intervals = dict(POLL)
+    overrides = []
+    
+    if config_path and Path(config_path).exists():
+        try:
+            with open(config_path, 'r') as f:
+                overrides.append(json.load(f).get('dashboard', {}).get('poll_intervals', {}))
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️ Error loading poll intervals from {config_path}: {e}")
+    
+    env_value = os.environ.get(POLL_ENV_VAR)
+    if env_value:
+        try:
+            overrides.append(json.loads(env_value))
+        except ValueError as e:
+            print(f"⚠️ Ignoring invalid {POLL_ENV_VAR}: {e}")
+    
+    for override in overrides:
+        if not isinstance(override, dict):
+            print(f"⚠️ Ignoring poll intervals that are not a JSON object: {override!r}")
+            continue
+        for name, value in override.items():
+            if name not in intervals:
+                continue
+            try:
+                seconds = float(value)
+            except (TypeError, ValueError):
+                seconds = math.nan
+            if math.isnan(seconds):
+                print(f"⚠️ Ignoring invalid poll interval for {name}: {value!r}")
+                continue
+            intervals[name] = min(POLL_MAX, max(POLL_MIN, seconds))
+    
+    return intervals
+
+def _read_battery():
+    battery = sensors_battery()
+    return battery.percent if battery else 85.0
+
+def _read_cpu():
+    # Non-blocking: CPU usage since the previous call (primed in sampler)
+    return psutil.cpu_percent(interval=None)
+
+def _read_memory():
+    return psutil.virtual_memory().percent
+
+_READERS = {'battery': _read_battery, 'cpu': _read_cpu, 'memory': _read_memory}
+
+# Two workers, so a slow battery probe (WMI on Windows) can't hold up CPU/memory
+_read_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='live-dashboard-read')
+READ_TIMEOUT = 1.0  # seconds; a slower read keeps the previous sample
+
+def _notify_live_data_changed():
+    """Wake SSE streams; the caller must hold live_data_changed"""
+    global _live_version
+    _live_version += 1
+    live_data_changed.notify_all()
 
-def update_system_metrics():
-    """Update system metrics continuously"""
-    global live_data
-    action_counter = 0
+def _swap_live_data(new_data):
+    """Publish a new live_data dict and its encoding; the caller must hold live_data_lock.
+    
+    Published dicts are never mutated, and rebinding a global is atomic, so a
+    reader sees either the previous state or the new one, never a mix.
+    """
+    global live_data, _snapshot
+    live_data = new_data
+    _snapshot = _serialize(new_data)
+
+_clock = (None, '')
+
+def _clock_text() -> str:
+    """Wall-clock HH:MM:SS, formatted once per second however many pollers ask"""
+    global _clock
+    now = int(time.time())
+    if _clock[0] != now:
+        t = time.localtime(now)
+        _clock = (now, f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}")
+    return _clock[1]
+
+def _publish_samples():
+    """Write the latest samples, and the power derived from them, into live_data"""
+    # Estimate power consumption (simplified)
+    inputs = np.array([_samples[name] for name in POWER_INPUTS], dtype=np.float64)
+    power_draw = POWER_BIAS + float(POWER_WEIGHTS @ inputs)
+    
+    values = {
+        'battery': f"{_samples['battery']:.1f}",
+        'cpu': f"{_samples['cpu']:.1f}",
+        'memory': f"{_samples['memory']:.1f}",
+        'power': f"{power_draw:.1f}",
+        'status': 'Active'
+    }
+    
+    with live_data_changed:
+        changed = any(live_data.get(key) != value for key, value in values.items())
+        _swap_live_data({**live_data, **values, 'timestamp': _clock_text()})
+        if changed:
+            _notify_live_data_changed()
+
+def _decide_actions():
+    """Simulate AI decisions based on real metrics"""
+    battery_percent = _samples['battery']
+    cpu_percent = _samples['cpu']
+    memory_percent = _samples['memory']
+    actions = []
+    
+    if battery_percent < 30:
+        actions.append(f"🔋 LOW BATTERY: Reducing brightness by {30 + (30-battery_percent)}%")
+        actions.append(f"🧠 CPU throttling to save {15 + (30-battery_percent)/2:.0f}% power")
+    
+    if cpu_percent > 70:
+        actions.append(f"🧠 HIGH CPU: Limiting background processes - Est. {cpu_percent*0.2:.0f}% savings")
+    
+    if memory_percent > 80:
+        actions.append(f"💾 HIGH MEMORY: Optimizing memory usage - Est. {memory_percent*0.15:.0f}% savings")
+    
+    if not actions:
+        actions.append(f"✅ System optimized: {battery_percent:.0f}% battery, {cpu_percent:.0f}% CPU load")
+    
+    return actions
+
+async def _poll_metric(name: str, interval: float):
+    """Sample one metric on its own cadence without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    read = _READERS[name]
     
     while True:
         try:
-            # Get real system metrics using psutil
-            battery = psutil.sensors_battery()
-            battery_percent = battery.percent if battery else 85.0
-            
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory_percent = psutil.virtual_memory().percent
-            
-            # Estimate power consumption (simplified)
-            power_draw = 8.0 + (cpu_percent * 0.15) + (memory_percent * 0.05)
-            
-            # Update live data
-            live_data.update({
-                'battery': f"{battery_percent:.1f}",
-                'cpu': f"{cpu_percent:.1f}",
-                'memory': f"{memory_percent:.1f}",
-                'power': f"{power_draw:.1f}",
-                'timestamp': datetime.now().strftime('%H:%M:%S'),
-                'status': 'Active'
-            })
-            
-            # Simulate AI decisions based on real metrics
-            action_counter += 1
-            if action_counter % 10 == 0:  # Every 20 seconds
-                actions = []
-                
-                if battery_percent < 30:
-                    actions.append(f"🔋 LOW BATTERY: Reducing brightness by {30 + (30-battery_percent)}%")
-                    actions.append(f"🧠 CPU throttling to save {15 + (30-battery_percent)/2:.0f}% power")
-                
-                if cpu_percent > 70:
-                    actions.append(f"🧠 HIGH CPU: Limiting background processes - Est. {cpu_percent*0.2:.0f}% savings")
-                
-                if memory_percent > 80:
-                    actions.append(f"💾 HIGH MEMORY: Optimizing memory usage - Est. {memory_percent*0.15:.0f}% savings")
-                
-                if not actions:
-                    actions.append(f"✅ System optimized: {battery_percent:.0f}% battery, {cpu_percent:.0f}% CPU load")
-                
-                live_data['actions'] = actions
-                
-        except Exception as e:
+            # psutil can still touch sysfs/WMI, so keep it off the loop
+            _samples[name] = await asyncio.wait_for(loop.run_in_executor(_read_pool, read), READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        except Exception:
             # Fallback data if psutil fails
-            live_data.update({
-                'battery': '75.0',
-                'cpu': '45.2',
-                'memory': '62.1',
-                'power': '11.5',
-                'timestamp': datetime.now().strftime('%H:%M:%S'),
-                'actions': ['🤖 AI monitoring system metrics...']
-            })
+            _samples[name] = _FALLBACK_SAMPLES[name]
         
-        time.sleep(2)  # Update every 2 seconds
+        _publish_samples()
+        await asyncio.sleep(interval)
+
+async def _poll_actions(interval: float):
+    """Refresh the simulated optimization actions"""
+    while True:
+        await asyncio.sleep(interval)
+        actions = _decide_actions()
+        with live_data_changed:
+            if live_data['actions'] != actions:
+                _swap_live_data({**live_data, 'actions': actions})
+                _notify_live_data_changed()
+
+async def sampler(intervals=None):
+    """Run every metric poller concurrently on the current event loop"""
+    if intervals is None:
+        intervals = load_poll_intervals()
+    
+    # Prime cpu_percent so the first non-blocking read has a baseline
+    psutil.cpu_percent(interval=None)
+    
+    pollers = [_poll_metric(name, intervals[name]) for name in _READERS]
+    pollers.append(_poll_actions(intervals['actions']))
+    await asyncio.gather(*pollers)
+
+def run_sampler(intervals=None, debug: bool = False):
+    """Run the sampler on its own asyncio event loop"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    if debug:
+        # Report any callback that blocks the loop for more than 50ms
+        loop.set_debug(True)
+        loop.slow_callback_duration = 0.05
+    try:
+        loop.run_until_complete(sampler(intervals))
+    finally:
+        loop.close()
 
 def main():
+    parser = argparse.ArgumentParser(description='Live Battery Optimization Dashboard')
+    parser.add_argument('--config', type=str, default='config/default.json',
+                      help='Configuration file path (reads dashboard.poll_intervals)')
+    args = parser.parse_args()
+    
     print("🚀 Starting Live Dashboard...")
     print("📊 This version uses direct system calls for reliability")
     
-    # Start the background metrics thread
-    metrics_thread = threading.Thread(target=update_system_metrics, daemon=True)
+    intervals = load_poll_intervals(args.config)
+    print("⏱️ Poll intervals: " + ", ".join(f"{name} {seconds:g}s" for name, seconds in intervals.items()))
+    
+    # Start the background metrics event loop
+    metrics_thread = threading.Thread(target=run_sampler, args=(intervals,), daemon=True)
     metrics_thread.start()
     
     print("✅ Metrics collection started!")
@@ -395,7 +670,14 @@ def main():
     print("🛑 Press Ctrl+C to stop")
     
     try:
-        app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
+        if WAITRESS_AVAILABLE:
+            # Each open /api/stream holds a worker, so leave headroom over plain requests;
+            # the long channel timeout keeps idle SSE connections open between pushes
+            waitress.serve(app, host='0.0.0.0', port=5000, threads=8,
+                           connection_limit=64, channel_timeout=120)
+        else:
+            print("⚠️ waitress not available, using Flask development server")
+            app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
     except KeyboardInterrupt:
         print("\n🛑 Dashboard stopped!")
 
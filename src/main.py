@@ -4,7 +4,6 @@ Main entry point for the On-Device Agentic Battery Optimization System
 """
 
 import sys
-import time
 import logging
 import argparse
 from pathlib import Path
@@ -13,11 +12,8 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 
 from core.agent_controller import AgentController
-from core.monitoring import SystemMonitor
-from core.reasoning import BatteryOptimizationAgent
-from core.actions import OptimizationActuator
-from dashboard.web_dashboard import WebDashboard
 from utils.logger import setup_logging
+from utils.shutdown import wait_for_interrupt
 
 def main():
     """Main function to start the battery optimization system"""
@@ -46,6 +42,8 @@ def main():
         
         # Start web dashboard if requested
         if args.dashboard:
+            # Flask and the dashboard stack are only loaded when requested
+            from dashboard.web_dashboard import WebDashboard
             dashboard = WebDashboard(controller)
             dashboard.start(threaded=True)
             logger.info("📊 Web dashboard started at http://localhost:5000")
@@ -61,13 +59,10 @@ def main():
         logger.info("🤖 Starting agentic optimization loop...")
         controller.start()
         
-        # Keep the main thread alive
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            logger.info("🛑 Stopping battery optimization system...")
-            controller.stop()
+        # Keep the main thread alive, asleep until Ctrl+C
+        wait_for_interrupt()
+        logger.info("🛑 Stopping battery optimization system...")
+        controller.stop()
             
     except Exception as e:
         logger.error(f"❌ Error starting system: {e}")
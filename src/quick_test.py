@@ -5,6 +5,7 @@ Quick test to see battery optimization in action
 
 import sys
 import time
+import functools
 from pathlib import Path
 
 # Add project root to path
@@ -14,6 +15,61 @@ from core.monitoring import SystemMonitor, SystemMetrics
 from core.reasoning import BatteryOptimizationAgent
 from core.actions import OptimizationActuator
 
+# Metric header shared by the three scenarios
+_METRICS_TMPL = (
+    "{label} Battery: {bat:.1f}%{notes[0]}\n"
+    "{label} CPU: {cpu:.1f}%{notes[1]}\n"
+    "{label} Power: {pw:.1f}W{notes[2]}\n"
+    "{br_label} Brightness: {br}%{notes[3]}\n"
+)
+
+# Per-action report lines, filled straight from the action's fields
+_ACTION_TMPL = (
+    "{action_type}\n"
+    "     Intensity: {intensity:.2f}{note}\n"
+    "     Savings: {estimated_savings:.1f}%\n"
+    "     Impact: {performance_impact:.2f}\n"
+    "     Confidence: {confidence:.2f}\n"
+)
+_BRIEF_ACTION_TMPL = (
+    "{action_type}\n"
+    "     Intensity: {intensity:.2f}\n"
+    "     Savings: {estimated_savings:.1f}%\n"
+    "     Confidence: {confidence:.2f}\n"
+)
+
+@functools.lru_cache(maxsize=256)
+def _format_action(template, action_type, intensity, estimated_savings, performance_impact, confidence, note):
+    """Render an action's report lines; the agent emits the same actions run after run"""
+    return template.format(action_type=action_type, intensity=intensity,
+                           estimated_savings=estimated_savings,
+                           performance_impact=performance_impact,
+                           confidence=confidence, note=note)
+
+def _write_actions(actions, template=_ACTION_TMPL, note=None):
+    """Write every action of a scenario with a single stdout write"""
+    parts = [
+        f"  {i}. " + _format_action(template, action.action_type, action.intensity,
+                                    action.estimated_savings, action.performance_impact,
+                                    action.confidence, note(action) if note else '')
+        for i, action in enumerate(actions, 1)
+    ]
+    sys.stdout.write("".join(parts))
+    sys.stdout.flush()
+
+def _write_metrics(label, metrics, notes=('', '', '', ''), br_label=None):
+    """Write a scenario's metric header with a single stdout write"""
+    sys.stdout.write(_METRICS_TMPL.format(
+        label=label,
+        br_label=br_label or label,
+        bat=metrics.battery_percent,
+        cpu=metrics.cpu_percent,
+        pw=metrics.battery_power_draw,
+        br=metrics.screen_brightness,
+        notes=notes
+    ))
+    sys.stdout.flush()
+
 def test_battery_scenarios():
     print("🔋 BATTERY OPTIMIZATION TEST")
     print("=" * 50)
@@ -30,19 +86,12 @@ def test_battery_scenarios():
     print("-" * 40)
     
     metrics = monitor.collect_metrics()
-    print(f"Current Battery: {metrics.battery_percent:.1f}%")
-    print(f"Current CPU: {metrics.cpu_percent:.1f}%")
-    print(f"Current Power: {metrics.battery_power_draw:.1f}W")
-    print(f"Screen Brightness: {metrics.screen_brightness}%")
+    _write_metrics("Current", metrics, br_label="Screen")
     
     actions = agent.decide_optimization(metrics)
     print(f"\n🤖 Agent Recommendation: {len(actions)} optimization(s)")
     
-    for i, action in enumerate(actions, 1):
-        print(f"  {i}. {action.action_type}")
-        print(f"     Intensity: {action.intensity:.2f}")
-        print(f"     Savings: {action.estimated_savings:.1f}%")
-        print(f"     Confidence: {action.confidence:.2f}")
+    _write_actions(actions, _BRIEF_ACTION_TMPL)
     
     if not actions:
         print("  ✅ No optimizations needed - system is efficient!")
@@ -71,22 +120,13 @@ def test_battery_scenarios():
         target_app_memory=20.0
     )
     
-    print(f"Simulated Battery: {low_battery_metrics.battery_percent:.1f}% (LOW!)")
-    print(f"Simulated CPU: {low_battery_metrics.cpu_percent:.1f}% (HIGH!)")
-    print(f"Simulated Power: {low_battery_metrics.battery_power_draw:.1f}W (HIGH!)")
-    print(f"Simulated Brightness: {low_battery_metrics.screen_brightness}% (HIGH!)")
+    _write_metrics("Simulated", low_battery_metrics, notes=(" (LOW!)", " (HIGH!)", " (HIGH!)", " (HIGH!)"))
     
     low_actions = agent.decide_optimization(low_battery_metrics)
     print(f"\n🤖 Agent Recommendation: {len(low_actions)} optimization(s)")
     
-    total_savings = 0
-    for i, action in enumerate(low_actions, 1):
-        print(f"  {i}. {action.action_type}")
-        print(f"     Intensity: {action.intensity:.2f}")
-        print(f"     Savings: {action.estimated_savings:.1f}%")
-        print(f"     Impact: {action.performance_impact:.2f}")
-        print(f"     Confidence: {action.confidence:.2f}")
-        total_savings += action.estimated_savings
+    _write_actions(low_actions)
+    total_savings = sum(action.estimated_savings for action in low_actions)
     
     if low_actions:
         print(f"\n💡 Total Estimated Savings: {total_savings:.1f}%")
@@ -115,22 +155,14 @@ def test_battery_scenarios():
         target_app_memory=35.0
     )
     
-    print(f"Critical Battery: {critical_metrics.battery_percent:.1f}% (CRITICAL!)")
-    print(f"Critical CPU: {critical_metrics.cpu_percent:.1f}% (VERY HIGH!)")
-    print(f"Critical Power: {critical_metrics.battery_power_draw:.1f}W (EXTREME!)")
-    print(f"Critical Brightness: {critical_metrics.screen_brightness}% (MAX!)")
+    _write_metrics("Critical", critical_metrics, notes=(" (CRITICAL!)", " (VERY HIGH!)", " (EXTREME!)", " (MAX!)"))
     
     critical_actions = agent.decide_optimization(critical_metrics)
     print(f"\n🚨 EMERGENCY MODE: {len(critical_actions)} AGGRESSIVE optimization(s)")
     
-    total_critical_savings = 0
-    for i, action in enumerate(critical_actions, 1):
-        print(f"  {i}. {action.action_type}")
-        print(f"     Intensity: {action.intensity:.2f} ({'HIGH!' if action.intensity > 0.6 else 'MODERATE'})")
-        print(f"     Savings: {action.estimated_savings:.1f}%")
-        print(f"     Impact: {action.performance_impact:.2f}")
-        print(f"     Confidence: {action.confidence:.2f}")
-        total_critical_savings += action.estimated_savings
+    _write_actions(critical_actions,
+                   note=lambda action: ' (HIGH!)' if action.intensity > 0.6 else ' (MODERATE)')
+    total_critical_savings = sum(action.estimated_savings for action in critical_actions)
     
     if critical_actions:
         print(f"\n⚡ Total Emergency Savings: {total_critical_savings:.1f}%")
@@ -8,16 +8,82 @@ import sys
 import time
 import threading
 import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import psutil
 from pathlib import Path
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent))
 
-from core.monitoring import SystemMonitor
-from core.reasoning import BatteryOptimizationAgent
-from core.actions import OptimizationActuator
-from core.agent_controller import AgentController
+from utils.shutdown import wait_for_interrupt
+
+# Try to import the JIT compiler (optional); without it the load loop runs as plain Python
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Identity stand-in for numba.njit"""
+        return lambda func: func
+
+_BUSY_CHUNK = 20000  # iterations timed to calibrate the kernel
+_STRESS_SLEEP = 0.01  # idle part of each duty cycle, in seconds
+_PAGE_SIZE = 4096
+
+# Per-cycle report, formatted in one pass and written once
+_CYCLE_TMPL = (
+    "\n🔍 Cycle {c} - Real System State:\n"
+    "   📊 CPU: {cpu:.1f}%\n"
+    "   💾 Memory: {mem:.1f}%\n"
+    "   🔋 Battery: {bat:.1f}%\n"
+    "   ⚡ Power: {pw:.1f}W\n"
+    "   💡 Brightness: {br}%\n"
+)
+_ACTION_TMPL = (
+    "      {i}. {action_type}\n"
+    "         Intensity: {intensity:.2f}\n"
+    "         Savings: {savings:.1f}%\n"
+    "         Confidence: {confidence:.2f}\n"
+)
+
+@njit(nogil=True, cache=True)
+def _busy(n_inner):
+    """Integer busy work the compiler can't reduce to a closed form"""
+    s = 0
+    for i in range(n_inner):
+        s = ((s ^ (i * i)) * 31) % 1000003
+    return s
+
+# Compile (or load from the cache) at import rather than in the first worker,
+# then measure the kernel so busy slices can be sized as iteration counts
+_busy(1)
+_calibration_start = time.perf_counter()
+_busy(_BUSY_CHUNK)
+_SECONDS_PER_ITER = max(1e-10, (time.perf_counter() - _calibration_start) / _BUSY_CHUNK)
+
+def _stress_loop(n_inner, cycles, duration, stopped):
+    """Run `cycles` rounds of n_inner kernel iterations, each followed by a short sleep"""
+    end_time = time.monotonic() + duration
+    for _ in range(cycles):
+        if stopped() or time.monotonic() >= end_time:
+            break
+        # CPU-intensive calculation in one call (releases the GIL when JIT-compiled)
+        _busy(n_inner)
+        time.sleep(_STRESS_SLEEP)  # Small break to control intensity
+
+# Stop flag inherited by stress pool processes (see _init_stress_worker)
+_stress_stop = None
+
+def _init_stress_worker(stop_event):
+    global _stress_stop
+    _stress_stop = stop_event
+
+def _cpu_stress_worker(n_inner, cycles, duration):
+    """Stress loop for a pool process; module level so it can be pickled"""
+    _stress_loop(n_inner, cycles, duration, _stress_stop.is_set)
 
 class RealSystemTester:
     """Test the system with real CPU/memory loads"""
@@ -26,42 +92,72 @@ class RealSystemTester:
         print("🔋 REAL SYSTEM BATTERY OPTIMIZATION TEST")
         print("=" * 60)
         
-        # Initialize the full system
-        self.controller = AgentController()
+        # The full system is only initialized once a test needs it
+        self._controller = None
         self.stress_threads = []
         self.monitoring = True
         
+        # Process pool used for CPU load when the kernel can't release the GIL
+        self._pool = None
+        self._pool_stop = None
+    
+    @property
+    def controller(self):
+        """Agent controller, created on first use (loads the models)"""
+        if self._controller is None:
+            from core.agent_controller import AgentController
+            self._controller = AgentController()
+        return self._controller
+        
     def create_cpu_load(self, intensity=0.5, duration=30):
         """Create real CPU load to trigger optimizations"""
         print(f"💻 Creating {intensity*100:.0f}% CPU load for {duration} seconds...")
         
-        def cpu_stress():
-            end_time = time.time() + duration
-            while time.time() < end_time and self.monitoring:
-                # CPU-intensive calculation
-                for _ in range(int(10000 * intensity)):
-                    _ = sum(i*i for i in range(1000))
-                time.sleep(0.01)  # Small break to control intensity
+        # Busy for `intensity` of each cycle and sleep for the rest
+        busy_slice = min(0.5, _STRESS_SLEEP * intensity / max(1e-3, 1.0 - intensity))
+        
+        # Work per slice and slice count are fixed up front, so the kernel runs
+        # a whole slice per call; the monotonic deadline only covers sleep overshoot
+        n_inner = max(1, int(busy_slice / _SECONDS_PER_ITER))
+        cycles = max(1, int(duration / (busy_slice + _STRESS_SLEEP)))
         
-        # Start multiple threads based on CPU cores
+        # Start multiple workers based on CPU cores
         num_threads = max(1, int(multiprocessing.cpu_count() * intensity))
+        
+        if not NUMBA_AVAILABLE:
+            # Interpreted workers would share one GIL, so give each its own process
+            if self._pool is None:
+                self._pool_stop = multiprocessing.Event()
+                self._pool = ProcessPoolExecutor(max_workers=num_threads,
+                                                 initializer=_init_stress_worker,
+                                                 initargs=(self._pool_stop,))
+            for _ in range(num_threads):
+                self._pool.submit(_cpu_stress_worker, n_inner, cycles, duration)
+            return
+        
         for _ in range(num_threads):
-            thread = threading.Thread(target=cpu_stress, daemon=True)
+            thread = threading.Thread(target=_stress_loop,
+                                      args=(n_inner, cycles, duration, lambda: not self.monitoring),
+                                      daemon=True)
             thread.start()
             self.stress_threads.append(thread)
     
+    def stop_stress_load(self):
+        """Stop every stress worker, threads and pool processes alike"""
+        self.monitoring = False
+        if self._pool is not None:
+            self._pool_stop.set()
+            self._pool.shutdown(wait=False)
+            self._pool = None
+    
     def create_memory_load(self, size_mb=500):
         """Create memory pressure"""
         print(f"💾 Creating {size_mb}MB memory load...")
         
         def memory_stress():
-            # Allocate memory
-            memory_hog = []
-            for _ in range(size_mb):
-                # Allocate 1MB chunks
-                chunk = bytearray(1024 * 1024)
-                memory_hog.append(chunk)
-                time.sleep(0.01)
+            # Allocate memory in one block, then write a byte per page so it becomes resident
+            memory_hog = np.empty(size_mb * 1024 * 1024, dtype=np.uint8)
+            memory_hog[::_PAGE_SIZE] = 1
             
             # Hold memory for a while
             time.sleep(30)
@@ -77,10 +173,10 @@ class RealSystemTester:
         print("Watch the agent make decisions based on actual system load!")
         print("-" * 60)
         
-        start_time = time.time()
+        end_time = time.monotonic() + duration
         cycle = 0
         
-        while time.time() - start_time < duration:
+        while time.monotonic() < end_time:
             cycle += 1
             
             # Get real system metrics
@@ -90,36 +186,42 @@ class RealSystemTester:
                 continue
             
             # Show current state
-            print(f"\n🔍 Cycle {cycle} - Real System State:")
-            print(f"   📊 CPU: {current_metrics.cpu_percent:.1f}%")
-            print(f"   💾 Memory: {current_metrics.memory_percent:.1f}%")
-            print(f"   🔋 Battery: {current_metrics.battery_percent:.1f}%")
-            print(f"   ⚡ Power: {current_metrics.battery_power_draw:.1f}W")
-            print(f"   💡 Brightness: {current_metrics.screen_brightness}%")
+            cpu = current_metrics.cpu_percent
+            mem = current_metrics.memory_percent
+            bat = current_metrics.battery_percent
+            pw = current_metrics.battery_power_draw
+            br = current_metrics.screen_brightness
+            out = [_CYCLE_TMPL.format(c=cycle, cpu=cpu, mem=mem, bat=bat, pw=pw, br=br)]
             
             # Get agent decisions
             actions = self.controller.agent.decide_optimization(current_metrics)
             
             if actions:
-                print(f"   🤖 Agent Response: {len(actions)} optimization(s) triggered!")
+                out.append(f"   🤖 Agent Response: {len(actions)} optimization(s) triggered!\n")
                 
                 total_savings = 0
                 for i, action in enumerate(actions, 1):
-                    print(f"      {i}. {action.action_type}")
-                    print(f"         Intensity: {action.intensity:.2f}")
-                    print(f"         Savings: {action.estimated_savings:.1f}%")
-                    print(f"         Confidence: {action.confidence:.2f}")
+                    out.append(_ACTION_TMPL.format(
+                        i=i,
+                        action_type=action.action_type,
+                        intensity=action.intensity,
+                        savings=action.estimated_savings,
+                        confidence=action.confidence
+                    ))
                     total_savings += action.estimated_savings
                 
-                print(f"   💡 Total Potential Savings: {total_savings:.1f}%")
+                out.append(f"   💡 Total Potential Savings: {total_savings:.1f}%\n")
                 
                 # Actually apply optimizations to see real impact
                 results = self.controller.actuator.apply_actions(actions)
-                successful = [r for r in results if r.success]
-                print(f"   ✅ Applied {len(successful)}/{len(actions)} optimizations")
+                successful = sum(1 for r in results if r.success)
+                out.append(f"   ✅ Applied {successful}/{len(actions)} optimizations\n")
                 
             else:
-                print(f"   ✅ No optimizations needed - system is efficient")
+                out.append(f"   ✅ No optimizations needed - system is efficient\n")
+            
+            sys.stdout.write("".join(out))
+            sys.stdout.flush()
             
             time.sleep(5)  # Check every 5 seconds
     
@@ -149,7 +251,7 @@ class RealSystemTester:
             
             # Phase 4: Cool down
             print("\n📈 PHASE 4: Cool Down (10 seconds)")
-            self.monitoring = False  # Stop stress threads
+            self.stop_stress_load()
             self.monitor_real_optimization(10)
             
         except KeyboardInterrupt:
@@ -157,7 +259,7 @@ class RealSystemTester:
         
         finally:
             # Clean up
-            self.monitoring = False
+            self.stop_stress_load()
             self.controller.stop()
             print("\n✅ Test completed")
     
@@ -214,12 +316,9 @@ def main():
             print("\n📊 System running with web dashboard...")
             print("Press Ctrl+C to stop")
             
-            try:
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                print("\n🛑 Stopping system...")
-                tester.controller.stop()
+            wait_for_interrupt()
+            print("\n🛑 Stopping system...")
+            tester.controller.stop()
         
         elif choice == "3":
             tester.controller.start()
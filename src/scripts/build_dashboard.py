@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Build script for the precompressed dashboard page
+
+Minifies the page's inline script with esbuild (if installed) and writes a
+Brotli-compressed copy to dashboard/static/dashboard.html.br, which the web
+dashboard serves to browsers that accept br.
+"""
+
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dashboard.web_dashboard import DASHBOARD_HTML, BROTLI_ASSET
+
+# Try to import the Brotli encoder (optional, falls back to the brotli CLI)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+SCRIPT_PATTERN = re.compile(r'(<script>)(.*?)(</script>)', re.DOTALL)
+
+def minify_scripts(html: str) -> str:
+    """Minify each inline <script> block with esbuild, leaving the markup as-is"""
+    esbuild = shutil.which('esbuild')
+    if not esbuild:
+        print("⚠️ esbuild not found, skipping script minification")
+        return html
+    
+    def minify(match):
+        result = subprocess.run(
+            [esbuild, '--minify', '--loader=js'],
+            input=match.group(2), capture_output=True, text=True, check=True
+        )
+        return match.group(1) + result.stdout.strip() + match.group(3)
+    
+    minified = SCRIPT_PATTERN.sub(minify, html)
+    print(f"✅ Minified scripts: {len(html)} -> {len(minified)} bytes")
+    return minified
+
+def brotli_compress(data: bytes) -> bytes:
+    """Compress with Brotli at maximum quality"""
+    if BROTLI_AVAILABLE:
+        return brotli.compress(data, quality=11)
+    
+    brotli_cli = shutil.which('brotli')
+    if not brotli_cli:
+        raise RuntimeError("Neither the brotli module nor the brotli CLI is available")
+    
+    result = subprocess.run([brotli_cli, '-q', '11', '-c'], input=data,
+                            capture_output=True, check=True)
+    return result.stdout
+
+def main() -> int:
+    html = minify_scripts(DASHBOARD_HTML).encode('utf-8')
+    
+    try:
+        compressed = brotli_compress(html)
+    except (RuntimeError, subprocess.CalledProcessError) as e:
+        print(f"❌ Brotli compression failed: {e}")
+        return 1
+    
+    BROTLI_ASSET.parent.mkdir(parents=True, exist_ok=True)
+    BROTLI_ASSET.write_bytes(compressed)
+    print(f"✅ Wrote {BROTLI_ASSET} ({len(compressed)} bytes)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,12 +3,33 @@
 Setup script for On-Device Agentic Battery Optimization System
 """
 
+import functools
+import importlib.util
 import os
 import sys
 import subprocess
 import platform
 from pathlib import Path
 
+@functools.lru_cache(maxsize=None)
+def _system():
+    """Platform name (e.g. 'Windows', 'Linux'), probed once"""
+    return platform.system()
+
+@functools.lru_cache(maxsize=None)
+def _is_admin():
+    """Whether we run with admin/root rights; None if it can't be determined"""
+    system = _system().lower()
+    if system == 'windows':
+        try:
+            import ctypes
+            return bool(ctypes.windll.shell32.IsUserAnAdmin())
+        except Exception:
+            return None
+    if hasattr(os, 'geteuid'):
+        return os.geteuid() == 0
+    return None
+
 def create_directories():
     """Create necessary directories"""
     directories = [
@@ -48,7 +69,7 @@ def check_system_requirements():
         print(f"✅ Python {python_version.major}.{python_version.minor}.{python_version.micro}")
     
     # Check platform
-    system = platform.system()
+    system = _system()
     print(f"✅ Platform: {system}")
     
     # Check available modules
@@ -56,12 +77,12 @@ def check_system_requirements():
     missing_modules = []
     
     for module in required_modules:
-        try:
-            __import__(module)
-            print(f"✅ {module} available")
-        except ImportError:
+        # Locate the module without executing it (cv2/sklearn imports are slow)
+        if importlib.util.find_spec(module) is None:
             missing_modules.append(module)
             print(f"⚠️  {module} not found")
+        else:
+            print(f"✅ {module} available")
     
     if missing_modules:
         print(f"📦 Missing modules will be installed: {', '.join(missing_modules)}")
@@ -80,22 +101,20 @@ def check_permissions():
     """Check if the system has necessary permissions"""
     print("🔒 Checking system permissions...")
     
-    system = platform.system().lower()
+    system = _system().lower()
     
     if system == 'windows':
-        try:
-            import ctypes
-            is_admin = ctypes.windll.shell32.IsUserAnAdmin()
-            if is_admin:
-                print("✅ Running with administrator privileges")
-            else:
-                print("⚠️  Not running as administrator - some optimizations may not work")
-                print("   Consider running as administrator for full functionality")
-        except Exception:
+        is_admin = _is_admin()
+        if is_admin is None:
             print("⚠️  Could not check administrator status")
+        elif is_admin:
+            print("✅ Running with administrator privileges")
+        else:
+            print("⚠️  Not running as administrator - some optimizations may not work")
+            print("   Consider running as administrator for full functionality")
     
     elif system == 'linux':
-        if os.geteuid() == 0:
+        if _is_admin():
             print("✅ Running with root privileges")
         else:
             print("⚠️  Not running as root - some optimizations may require sudo")
@@ -0,0 +1,35 @@
+"""
+Caching utilities for the battery optimization system
+"""
+
+import functools
+import threading
+import time
+
+def ttl_cached(ttl):
+    """Memoize a function's results for ``ttl`` seconds on the monotonic clock.
+    
+    Results are keyed by positional arguments, so this suits cheap-to-hash
+    calls such as sensor reads that change on the order of seconds.
+    """
+    def decorator(func):
+        cache = {}
+        lock = threading.Lock()
+        
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(args)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            
+            value = func(*args)
+            with lock:
+                cache[args] = (now + ttl, value)
+            return value
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    
+    return decorator
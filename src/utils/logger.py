@@ -2,13 +2,31 @@
 Logging utilities for the battery optimization system
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from datetime import datetime
 
+# Background listener that owns the file handler, if one is configured
+_listener = None
+
+def shutdown_logging():
+    """Flush queued records to disk and stop the file logging thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+atexit.register(shutdown_logging)
+
 def setup_logging(level='INFO', log_file=None, format_string=None):
     """Setup logging configuration for the application"""
+    global _listener
     
     # Default format
     if format_string is None:
@@ -28,6 +46,7 @@ def setup_logging(level='INFO', log_file=None, format_string=None):
     
     # Clear existing handlers
     root_logger.handlers.clear()
+    shutdown_logging()
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -43,7 +62,15 @@ def setup_logging(level='INFO', log_file=None, format_string=None):
         file_handler = logging.FileHandler(log_path)
         file_handler.setLevel(numeric_level)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        
+        # Callers only enqueue records; a listener thread does the disk writes
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setLevel(numeric_level)
+        root_logger.addHandler(queue_handler)
+        
+        _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
     
     # Reduce noise from some libraries
     logging.getLogger('urllib3').setLevel(logging.WARNING)
@@ -67,10 +94,19 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Colored level names are built once instead of per record
+        self._decorated = {level: f"{color}{level}{self.RESET}" for level, color in self.COLORS.items()}
+    
     def format(self, record):
-        log_color = self.COLORS.get(record.levelname, '')
-        record.levelname = f"{log_color}{record.levelname}{self.RESET}"
-        return super().format(record)
+        # Restore the level name so other handlers see the record unchanged
+        original = record.levelname
+        record.levelname = self._decorated.get(original, original)
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = original
 
 def setup_colored_logging(level='INFO'):
     """Setup colored console logging"""
@@ -0,0 +1,26 @@
+"""
+Shutdown helpers for the long-running entry points
+"""
+
+import signal
+import sys
+import threading
+
+# POSIX signals interrupt Event.wait immediately; on Windows the handler only
+# runs once the wait returns, so poll there often enough to stay responsive
+_HEARTBEAT = 1.0 if sys.platform == 'win32' else 60.0
+
+def wait_for_interrupt(heartbeat: float = _HEARTBEAT):
+    """Block the main thread until Ctrl+C (SIGINT) or SIGTERM arrives"""
+    stop = threading.Event()
+    
+    def handler(signum, frame):
+        stop.set()
+    
+    previous = {sig: signal.signal(sig, handler) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        while not stop.wait(heartbeat):
+            pass
+    finally:
+        for sig, old_handler in previous.items():
+            signal.signal(sig, old_handler)
@@ -3,13 +3,38 @@
 Visual Video Quality Demo - Shows actual video that changes quality in real-time
 """
 
+import bisect
 import cv2
 import numpy as np
 import time
-import threading
 from core.reasoning import OptimizationAction
+from demo_app.frame_synthesis import GradientRenderer, dim_color
 import os
 
+# Window size the video is shown at, and the frame height each quality level
+# corresponds to; frames are synthesized at the display size scaled by quality
+# level and quality factor, so every optimization step visibly softens the picture
+DISPLAY_SIZE = (960, 540)
+SOURCE_HEIGHT = 1080
+QUALITY_HEIGHTS = {"1080p": 1080, "720p": 720, "480p": 480}
+
+# Simulated battery timeline: (seconds into the demo, battery level, message);
+# each level is shown for 8 seconds, and a None level marks the end of the demo
+BATTERY_SCHEDULE = [
+    (3, 85, "🔋 Battery: 85% - Full quality"),
+    (11, 50, "🔋 Battery: 50% - Medium optimization"),
+    (19, 25, "🔋 Battery: 25% - Low battery optimization"),
+    (27, 10, "🔋 Battery: 10% - Critical optimization"),
+    (35, 5, "🔋 Battery: 5% - Emergency mode"),
+    (43, 80, "🔌 Plugged in: 80% - Quality restored"),
+    (51, None, "🎯 Demo complete! Press 'q' in video window to exit"),
+]
+SCHEDULE_TIMES = [entry[0] for entry in BATTERY_SCHEDULE]
+
+def schedule_step(elapsed):
+    """Index of the BATTERY_SCHEDULE entry active after elapsed seconds (-1 before the first)"""
+    return bisect.bisect_right(SCHEDULE_TIMES, elapsed) - 1
+
 class VisualVideoPlayer:
     """A video player that shows actual visual quality changes"""
     
@@ -20,62 +45,104 @@ class VisualVideoPlayer:
         self.quality_factor = 1.0
         self.brightness = 1.0
         
+        # Gradient background with trig tables cached per frame size
+        self._gradient = GradientRenderer(time_step=0.1, spatial_step=0.01)
+        
+        # Overlay strings per player state, so frames don't reformat them
+        self._text_cache = {}
+        
+        # Render and display buffers, reused while the frame size is unchanged
+        self._frame = None
+        self._display = np.empty((DISPLAY_SIZE[1], DISPLAY_SIZE[0], 3), dtype=np.uint8)
+        
+    def render_size(self):
+        """Frame size to synthesize for the current quality, at most the display size"""
+        display_w, display_h = DISPLAY_SIZE
+        source_height = QUALITY_HEIGHTS.get(self.current_quality, SOURCE_HEIGHT) * self.quality_factor
+        height = min(display_h, max(1, int(display_h * source_height / SOURCE_HEIGHT)))
+        return max(1, display_w * height // display_h), height
+        
+    def overlay_text(self):
+        """Status and quality labels for the current state"""
+        key = (self.current_quality, self.current_fps, self.quality_factor)
+        text = self._text_cache.get(key)
+        if text is None:
+            text = self._text_cache[key] = (f"{self.current_quality} @ {self.current_fps}fps",
+                                            f"Quality: {self.quality_factor:.1f}x")
+        return text
+        
     def create_sample_video_frame(self, width, height, frame_num):
-        """Create a colorful sample video frame"""
+        """Create a colorful sample video frame (the buffer is reused by the next call)"""
         # Create a colorful animated frame
-        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        if self._frame is None or self._frame.shape[:2] != (height, width):
+            self._frame = np.empty((height, width, 3), dtype=np.uint8)
+        frame = self._frame
+        
+        # Layout is defined for a 1080p frame; scale it to the render size
+        scale = SOURCE_HEIGHT / height
         
-        # Moving gradient background
-        for y in range(height):
-            for x in range(width):
-                r = int(128 + 127 * np.sin(frame_num * 0.1 + x * 0.01))
-                g = int(128 + 127 * np.sin(frame_num * 0.1 + y * 0.01))
-                b = int(128 + 127 * np.sin(frame_num * 0.1 + (x + y) * 0.005))
-                frame[y, x] = [b, g, r]  # BGR format
+        # Moving gradient background (BGR format), with brightness applied as
+        # it is synthesized rather than in a separate pass
+        brightness = self.brightness
+        self._gradient.render(frame, frame_num, scale, brightness)
+        
+        status_text, quality_text = self.overlay_text()
         
         # Add moving text
-        text_x = int(50 + 100 * np.sin(frame_num * 0.05))
-        cv2.putText(frame, f"{self.current_quality} @ {self.current_fps}fps", 
-                   (text_x, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 2)
+        text_x = int((50 + 100 * np.sin(frame_num * 0.05)) / scale)
+        cv2.putText(frame, status_text, 
+                   (text_x, int(50 / scale)), cv2.FONT_HERSHEY_SIMPLEX, 1.5 / scale,
+                   dim_color((255, 255, 255), brightness), max(1, int(2 / scale)))
         
         # Add quality indicator
-        quality_text = f"Quality: {self.quality_factor:.1f}x"
-        cv2.putText(frame, quality_text, (50, height - 50), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-        
-        # Apply quality reduction (blur for lower quality)
-        if self.quality_factor < 1.0:
-            blur_amount = int((1.0 - self.quality_factor) * 10) + 1
-            frame = cv2.blur(frame, (blur_amount, blur_amount))
+        cv2.putText(frame, quality_text, (int(50 / scale), height - int(50 / scale)), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 1 / scale, dim_color((0, 255, 0), brightness),
+                   max(1, int(2 / scale)))
         
-        # Apply brightness
-        if self.brightness < 1.0:
-            frame = cv2.convertScaleAbs(frame, alpha=self.brightness, beta=0)
+        # Lower quality needs no extra blur: the frame is already rendered at
+        # lower resolution and upscaled for display
         
         return frame
     
-    def start_video(self):
-        """Start playing the visual video"""
+    def _apply_schedule_step(self, step):
+        """Announce a BATTERY_SCHEDULE entry and apply its battery level"""
+        _, battery, desc = BATTERY_SCHEDULE[step]
+        print(f"\n{desc}")
+        if battery is not None:
+            print("=" * 50)
+            self.optimize_for_battery(battery)
+    
+    def start_video(self, simulate_battery=False):
+        """Start playing the visual video, optionally following BATTERY_SCHEDULE"""
         print("🎥 Starting visual video player...")
         print("📺 You should see a colorful animated video window")
         print("🎯 Watch for quality changes when battery gets low!")
         
         self.playing = True
         frame_num = 0
-        
-        # Initial settings - Full HD
-        width, height = 1920, 1080
+        start = time.monotonic()
+        step = -1
         
         while self.playing:
             try:
-                # Create frame
+                # Advance the simulated battery when the next scheduled time passes
+                if simulate_battery:
+                    new_step = schedule_step(time.monotonic() - start)
+                    if new_step != step:
+                        step = new_step
+                        self._apply_schedule_step(step)
+                
+                # Create frame directly at the resolution the quality level allows
+                width, height = self.render_size()
                 frame = self.create_sample_video_frame(width, height, frame_num)
                 
-                # Resize for display (so it fits on screen)
-                display_frame = cv2.resize(frame, (960, 540))
+                # Upscale to the window size if rendered below it
+                if (width, height) != DISPLAY_SIZE:
+                    frame = cv2.resize(frame, DISPLAY_SIZE, dst=self._display,
+                                       interpolation=cv2.INTER_LINEAR)
                 
                 # Show the frame
-                cv2.imshow('Battery-Optimized Video Player', display_frame)
+                cv2.imshow('Battery-Optimized Video Player', frame)
                 
                 # Handle window events
                 key = cv2.waitKey(int(1000 / self.current_fps)) & 0xFF
@@ -130,30 +197,6 @@ class VisualVideoPlayer:
         """Stop the video"""
         self.playing = False
 
-def battery_simulation_thread(player):
-    """Simulate battery dropping and show optimizations"""
-    battery_levels = [85, 50, 25, 10, 5, 80]  # Simulate battery changes
-    descriptions = [
-        "🔋 Battery: 85% - Full quality",
-        "🔋 Battery: 50% - Medium optimization", 
-        "🔋 Battery: 25% - Low battery optimization",
-        "🔋 Battery: 10% - Critical optimization",
-        "🔋 Battery: 5% - Emergency mode",
-        "🔌 Plugged in: 80% - Quality restored"
-    ]
-    
-    time.sleep(3)  # Let video start
-    
-    for i, (battery, desc) in enumerate(zip(battery_levels, descriptions)):
-        print(f"\n{desc}")
-        print("=" * 50)
-        player.optimize_for_battery(battery)
-        
-        # Show each level for 8 seconds
-        time.sleep(8)
-    
-    print("\n🎯 Demo complete! Press 'q' in video window to exit")
-
 def main():
     print("🚀 VISUAL VIDEO QUALITY DEMO")
     print("=" * 60)
@@ -164,13 +207,9 @@ def main():
     
     player = VisualVideoPlayer()
     
-    # Start battery simulation in background
-    battery_thread = threading.Thread(target=battery_simulation_thread, args=(player,), daemon=True)
-    battery_thread.start()
-    
     try:
-        # Start the visual video (blocking)
-        player.start_video()
+        # Start the visual video (blocking); the battery simulation runs in its loop
+        player.start_video(simulate_battery=True)
     except KeyboardInterrupt:
         print("\n🛑 Stopping demo...")
     finally:
@@ -7,10 +7,62 @@ Shows actual video quality changes in your browser - just like screen brightness
 from flask import Flask, render_template_string, Response, jsonify
 import cv2
 import numpy as np
+import atexit
+import os
 import time
 import threading
+import queue
 import io
 import base64
+from demo_app.frame_synthesis import GradientRenderer, dim_color
+
+# Try to import the libjpeg-turbo bindings (optional); without them OpenCV encodes
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
+
+# Try to import the production WSGI server (optional)
+try:
+    import waitress
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+JPEG_QUALITY = 80
+WEBP_QUALITY = 75
+
+# Stream image format. WebP frames are about a third the size of JPEG but take
+# far longer to encode, so it is opt-in for viewers on slow links
+FORMAT_ENV_VAR = 'WEB_VIDEO_FORMAT'
+STREAM_MIMETYPES = {'jpeg': 'image/jpeg', 'webp': 'image/webp'}
+
+def webp_supported():
+    """Whether this OpenCV build can encode WebP"""
+    try:
+        ok, _ = cv2.imencode('.webp', np.zeros((8, 8, 3), dtype=np.uint8))
+    except cv2.error:
+        return False
+    return bool(ok)
+
+def resolve_stream_format():
+    """Stream format from the environment, falling back to JPEG"""
+    requested = os.environ.get(FORMAT_ENV_VAR, 'jpeg').strip().lower()
+    if requested == 'webp' and webp_supported():
+        return 'webp'
+    if requested not in STREAM_MIMETYPES:
+        print(f"⚠️ Unknown {FORMAT_ENV_VAR}={requested!r}, streaming JPEG")
+    elif requested == 'webp':
+        print("⚠️ WebP encoding not available in this OpenCV build, streaming JPEG")
+    return 'jpeg'
+
+# Slack around the frame in the pre-generated noise field; each frame reads
+# a window at a random offset within it
+NOISE_MARGIN = 64
+
+# Frame buffers shared by the producer and encoder threads
+FRAME_BUFFERS = 2
 
 app = Flask(__name__)
 
@@ -24,52 +76,115 @@ class WebVideoPlayer:
         self.frame_count = 0
         self.running = True
         
-    def create_video_frame(self):
-        """Create a colorful sample video frame"""
-        # Base size
-        width, height = 640, 360
+        # Base size and the gradient background renderer
+        self.width, self.height = 640, 360
+        self._gradient = GradientRenderer(time_step=0.05, spatial_step=0.02)
+        
+        # Frame pipeline: producer -> frame_q -> encoder -> latest image,
+        # started by the first viewer and shared by all of them
+        self.frame_q = queue.Queue(maxsize=2)
+        self.stream_format = resolve_stream_format()
+        self._encoded = None
+        self._encoded_seq = 0
+        self._encoded_ready = threading.Condition()
+        self._pipeline_lock = threading.Lock()
+        self._pipeline_started = False
+        self._encoder = None
+        
+        # Open streams; the producer idles while nobody is watching
+        self._viewers = 0
+        self._watched = threading.Event()
+        
+        # SIMD JPEG encoder, if the bindings and the shared library are present
+        self._turbo = None
+        if TURBOJPEG_AVAILABLE:
+            try:
+                self._turbo = TurboJPEG()
+            except (OSError, RuntimeError):
+                pass
+        
+        # Double buffering: the producer draws into one frame while the encoder
+        # reads the other, and each goes back on the free list once encoded
+        self._free_frames = queue.Queue()
+        for _ in range(FRAME_BUFFERS):
+            self._free_frames.put(np.empty((self.height, self.width, 3), dtype=np.uint8))
+        
+        # Reduced-resolution canvases, one per quality level seen so far
+        self._canvases = {}
+        
+        # Overlay strings per player state, so frames don't reformat them
+        self._text_cache = {}
+        
+        # Noise for low quality, generated once and sampled at random offsets
+        self._rng = np.random.default_rng()
+        self._noise = self._rng.integers(0, 30, (self.height + NOISE_MARGIN, self.width + NOISE_MARGIN, 3),
+                                         dtype=np.uint8)
+        
+    def render_size(self):
+        """Size the background is synthesized at for the current quality factor"""
+        return (max(1, int(self.width * self.quality_factor)),
+                max(1, int(self.height * self.quality_factor)))
+        
+    def overlay_text(self):
+        """Status, battery and quality labels for the current state"""
+        key = (self.current_quality, self.current_fps, self.battery_level, self.quality_factor)
+        text = self._text_cache.get(key)
+        if text is None:
+            text = self._text_cache[key] = (f"{self.current_quality} @ {self.current_fps}fps",
+                                            f"Battery: {self.battery_level}%",
+                                            f"Quality: {self.quality_factor:.1f}x")
+        return text
+        
+    def create_video_frame(self, frame=None):
+        """Create a colorful sample video frame, drawing into frame if one is given"""
+        width, height = self.width, self.height
+        if frame is None:
+            frame = np.empty((height, width, 3), dtype=np.uint8)
         
-        # Create animated background
-        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        # Lower quality is rendered at lower resolution and upscaled, which
+        # softens the picture without a separate blur pass
+        render_w, render_h = self.render_size()
+        if (render_w, render_h) == (width, height):
+            canvas = frame
+        else:
+            canvas = self._canvases.get((render_w, render_h))
+            if canvas is None:
+                canvas = np.empty((render_h, render_w, 3), dtype=np.uint8)
+                self._canvases[(render_w, render_h)] = canvas
+        scale = width / render_w
         
-        # Moving gradient
-        for y in range(height):
-            for x in range(width):
-                r = int(128 + 127 * np.sin(self.frame_count * 0.05 + x * 0.02))
-                g = int(128 + 127 * np.sin(self.frame_count * 0.05 + y * 0.02))
-                b = int(128 + 127 * np.sin(self.frame_count * 0.05 + (x + y) * 0.01))
-                frame[y, x] = [b, g, r]
+        # Moving gradient (BGR); brightness is applied while synthesizing, and
+        # everything drawn on top uses colors dimmed to match
+        brightness = self.brightness
+        self._gradient.render(canvas, self.frame_count, scale, brightness)
         
         # Add moving circle
-        center_x = int(width/2 + 100 * np.sin(self.frame_count * 0.1))
-        center_y = int(height/2 + 50 * np.cos(self.frame_count * 0.1))
-        cv2.circle(frame, (center_x, center_y), 30, (255, 255, 255), -1)
+        center_x = int((width/2 + 100 * np.sin(self.frame_count * 0.1)) / scale)
+        center_y = int((height/2 + 50 * np.cos(self.frame_count * 0.1)) / scale)
+        cv2.circle(canvas, (center_x, center_y), max(1, int(30 / scale)),
+                   dim_color((255, 255, 255), brightness), -1, cv2.LINE_AA)
+        
+        if canvas is not frame:
+            cv2.resize(canvas, (width, height), dst=frame, interpolation=cv2.INTER_LINEAR)
+        
+        status_text, battery_text, quality_text = self.overlay_text()
         
         # Add quality text
-        cv2.putText(frame, f"{self.current_quality} @ {self.current_fps}fps", 
-                   (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+        cv2.putText(frame, status_text, 
+                   (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, dim_color((255, 255, 255), brightness), 2)
         
         # Add battery level
-        cv2.putText(frame, f"Battery: {self.battery_level}%", 
-                   (10, height - 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        cv2.putText(frame, battery_text, 
+                   (10, height - 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, dim_color((0, 255, 0), brightness), 2)
         
         # Add quality factor
-        cv2.putText(frame, f"Quality: {self.quality_factor:.1f}x", 
-                   (10, height - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-        
-        # Apply quality reduction (blur)
-        if self.quality_factor < 1.0:
-            blur_amount = int((1.0 - self.quality_factor) * 8) + 1
-            frame = cv2.blur(frame, (blur_amount, blur_amount))
-        
-        # Apply brightness reduction
-        if self.brightness < 1.0:
-            frame = cv2.convertScaleAbs(frame, alpha=self.brightness, beta=0)
+        cv2.putText(frame, quality_text, 
+                   (10, height - 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, dim_color((0, 255, 255), brightness), 2)
         
         # Add noise for lower quality
         if self.quality_factor < 0.7:
-            noise = np.random.randint(0, 30, frame.shape, dtype=np.uint8)
-            frame = cv2.add(frame, noise)
+            oy, ox = self._rng.integers(0, NOISE_MARGIN + 1, size=2)
+            cv2.add(frame, self._noise[oy:oy + height, ox:ox + width], dst=frame)
         
         self.frame_count += 1
         return frame
@@ -98,6 +213,90 @@ class WebVideoPlayer:
             self.current_fps = 15
             self.quality_factor = 0.3
             self.brightness = 0.5
+    
+    def _produce_frames(self):
+        """Synthesize frames at the current fps; waits for a free buffer while the encoder is behind"""
+        next_frame = time.monotonic()
+        while self.running:
+            if not self._watched.is_set():
+                self._watched.wait(timeout=0.5)
+                next_frame = time.monotonic()
+                continue
+            
+            try:
+                frame = self._free_frames.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self.frame_q.put(self.create_video_frame(frame))
+            
+            # Sleep off the rest of the frame interval, without accumulating lag
+            next_frame = max(next_frame + 1.0 / self.current_fps, time.monotonic())
+            time.sleep(max(0.0, next_frame - time.monotonic()))
+    
+    def _encode_frames(self):
+        """Encode queued frames and publish each one to the viewers"""
+        while self.running:
+            try:
+                frame = self.frame_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            encoded = self.encode_frame(frame)
+            self._free_frames.put(frame)
+            with self._encoded_ready:
+                self._encoded = encoded
+                self._encoded_seq += 1
+                self._encoded_ready.notify_all()
+    
+    def encode_frame(self, frame):
+        """Encode a BGR frame in the stream format"""
+        if self.stream_format == 'webp':
+            _, buffer = cv2.imencode('.webp', frame, [cv2.IMWRITE_WEBP_QUALITY, WEBP_QUALITY])
+            return buffer.tobytes()
+        return self.encode_jpeg(frame)
+    
+    def encode_jpeg(self, frame):
+        """Encode a BGR frame as JPEG bytes (4:2:0 subsampling)"""
+        if self._turbo is not None:
+            return self._turbo.encode(frame, quality=JPEG_QUALITY, pixel_format=TJPF_BGR,
+                                      jpeg_subsample=TJSAMP_420)
+        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+        return buffer.tobytes()
+    
+    def start_pipeline(self):
+        """Start the producer and encoder threads once"""
+        with self._pipeline_lock:
+            if self._pipeline_started:
+                return
+            threading.Thread(target=self._produce_frames, daemon=True).start()
+            self._encoder = threading.Thread(target=self._encode_frames, daemon=True)
+            self._encoder.start()
+            self._pipeline_started = True
+            atexit.register(self.stop_pipeline)
+    
+    def add_viewer(self):
+        """Register an open stream, resuming frame production"""
+        with self._pipeline_lock:
+            self._viewers += 1
+            self._watched.set()
+    
+    def remove_viewer(self):
+        """Unregister a closed stream, pausing production after the last one"""
+        with self._pipeline_lock:
+            self._viewers -= 1
+            if self._viewers == 0:
+                self._watched.clear()
+    
+    def stop_pipeline(self):
+        """Stop the pipeline, letting an in-flight encode finish before exit"""
+        self.running = False
+        if self._encoder is not None:
+            self._encoder.join(timeout=1.0)
+    
+    def wait_for_frame(self, last_seq, timeout=1.0):
+        """Wait for an encoded frame newer than last_seq; returns (seq, image bytes)"""
+        with self._encoded_ready:
+            self._encoded_ready.wait_for(lambda: self._encoded_seq != last_seq, timeout)
+            return self._encoded_seq, self._encoded
 
 # Global video player
 video_player = WebVideoPlayer()
@@ -212,11 +411,6 @@ VIDEO_HTML = """
                         `Battery: ${data.battery}% | Quality: ${data.quality} | FPS: ${data.fps}`;
                 });
         }
-        
-        // Auto-refresh video frame
-        setInterval(() => {
-            document.getElementById('video-frame').src = '/video_feed?' + new Date().getTime();
-        }, 200);
     </script>
 </body>
 </html>
@@ -226,16 +420,27 @@ VIDEO_HTML = """
 def index():
     return render_template_string(VIDEO_HTML)
 
+def generate_stream():
+    """Yield each newly encoded frame as a multipart part"""
+    video_player.start_pipeline()
+    boundary = f"--frame\r\nContent-Type: {STREAM_MIMETYPES[video_player.stream_format]}\r\n\r\n".encode()
+    seq = 0
+    video_player.add_viewer()
+    try:
+        # The last frame encoded before a pause is sent straight away
+        while video_player.running:
+            new_seq, image = video_player.wait_for_frame(seq)
+            if new_seq == seq:
+                continue
+            seq = new_seq
+            yield boundary + image + b'\r\n'
+    finally:
+        video_player.remove_viewer()
+
 @app.route('/video_feed')
 def video_feed():
-    """Generate video frames"""
-    frame = video_player.create_video_frame()
-    
-    # Convert to JPEG
-    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-    frame_bytes = buffer.tobytes()
-    
-    return Response(frame_bytes, mimetype='image/jpeg')
+    """Stream video frames over one connection (MJPEG, or WebP parts if configured)"""
+    return Response(generate_stream(), mimetype='multipart/x-mixed-replace; boundary=frame')
 
 @app.route('/set_battery/<int:level>')
 def set_battery(level):
@@ -256,7 +461,13 @@ def main():
     print("🔋 Click the battery buttons to see instant quality changes!")
     print("🛑 Press Ctrl+C to stop")
     
-    app.run(host='0.0.0.0', port=5001, debug=False)
+    if WAITRESS_AVAILABLE:
+        # Each open /video_feed holds a worker thread for as long as it is
+        # watched, so leave headroom for the page and the battery buttons
+        waitress.serve(app, host='0.0.0.0', port=5001, threads=8, connection_limit=64)
+    else:
+        print("⚠️ waitress not available, using Flask development server")
+        app.run(host='0.0.0.0', port=5001, debug=False, threaded=True)
 
 if __name__ == "__main__":
     main()